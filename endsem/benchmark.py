@@ -0,0 +1,429 @@
+from contextlib import redirect_stdout
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from converter_class import TemperatureConverter, ValidationHandler, ConversionLogger, ConversionHistory
+from log_storage import ColumnarLog
+from logger import DataAnalyzer, ChartCache
+from metrics import metrics
+
+
+def time_call(func, *args, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def print_result(label: str, seconds: float, rows: int):
+    rate = rows / seconds if seconds > 0 else float('inf')
+    print(f"  {label:<28} {seconds * 1000:>10.2f} ms  {rate:>14,.0f} rows/s")
+
+
+def bench_convert_many(rows: int = 100_000):
+    print(f"\nconvert vs convert_many ({rows:,} readings, C to F)")
+    converter = TemperatureConverter()
+    values = np.random.default_rng(0).uniform(-50, 150, rows)
+    scalar_values = values.tolist()
+
+    def per_call():
+        with redirect_stdout(io.StringIO()):
+            return [converter.convert(value, 'C', 'F') for value in scalar_values]
+
+    per_call_time = time_call(per_call, repeat=1)
+    bulk_time = time_call(converter.convert_many, values, 'C', 'F')
+
+    print_result("convert (per call)", per_call_time, rows)
+    print_result("convert_many (vectorized)", bulk_time, rows)
+    print(f"  speedup: {per_call_time / bulk_time:.0f}x")
+
+
+def bench_validate_many(rows: int = 100_000):
+    print(f"\nvalidate_temperature vs validate_many ({rows:,} readings, mixed scales)")
+    rng = np.random.default_rng(0)
+    values = rng.uniform(-600, 2000, rows)
+    scales = rng.choice(['C', 'F', 'K'], rows)
+    pairs = list(zip(values.tolist(), scales.tolist()))
+
+    def per_call():
+        return [ValidationHandler.validate_temperature(value, scale) for value, scale in pairs]
+
+    per_call_time = time_call(per_call, repeat=1)
+    bulk_time = time_call(ValidationHandler.validate_many, values, scales)
+    single_scale_time = time_call(ValidationHandler.validate_many, values, 'C')
+
+    print_result("validate_temperature", per_call_time, rows)
+    print_result("validate_many (vectorized)", bulk_time, rows)
+    print_result("validate_many (one scale)", single_scale_time, rows)
+    print(f"  speedup: {per_call_time / bulk_time:.0f}x")
+
+
+def bench_logging(rows: int = 20_000):
+    print(f"\nlog_conversion throughput ({rows:,} rows)")
+    modes = [
+        ("unbuffered", {}),
+        ("buffered", {'buffered': True}),
+        ("buffered + fsync", {'buffered': True, 'fsync': True}),
+        ("background queue", {'background': True}),
+        ("background queue + fsync", {'background': True, 'fsync': True}),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, options in modes:
+            log_file = os.path.join(tmp_dir, f"{label}.csv")
+            start = time.perf_counter()
+            with ConversionLogger(log_file, **options) as logger:
+                for value in range(rows):
+                    logger.log_conversion(value, 'C', value * 1.8 + 32, 'F')
+                caller_seconds = time.perf_counter() - start
+            print_result(label, time.perf_counter() - start, rows)
+
+            stats = logger.queue_stats()
+            if stats is not None:
+                print(f"    caller time {caller_seconds * 1000:>10.2f} ms  max depth {stats['max_depth']:,}  "
+                      f"write latency mean {stats['mean_write_latency'] * 1000:.2f} ms "
+                      f"max {stats['max_write_latency'] * 1000:.2f} ms")
+
+
+def measure_memory(build) -> int:
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def bench_history_memory(rows: int = 100_000):
+    print(f"\nin-memory history footprint ({rows:,} entries)")
+    timestamp = "2025-12-11 10:47:17"
+
+    def build_dicts():
+        history = []
+        for value in range(rows):
+            source_value = float(value)
+            target_value = source_value * 1.8 + 32
+            history.append({
+                'timestamp': timestamp[:-2] + f"{value % 60:02d}",
+                'source_value': source_value,
+                'source_scale': 'C',
+                'target_value': target_value,
+                'target_scale': 'F',
+                'conversion_type': "C to F"
+            })
+        return history
+
+    def build_ring_buffer():
+        history = ConversionHistory(capacity=rows)
+        for value in range(rows):
+            source_value = float(value)
+            history.add(timestamp[:-2] + f"{value % 60:02d}", source_value, 'C',
+                        source_value * 1.8 + 32, 'F')
+        return history
+
+    dict_bytes = measure_memory(build_dicts)
+    ring_bytes = measure_memory(build_ring_buffer)
+
+    print(f"  {'list of dicts':<28} {dict_bytes / 1e6:>10.2f} MB  {dict_bytes / rows:>10.1f} B/entry")
+    print(f"  {'ConversionHistory':<28} {ring_bytes / 1e6:>10.2f} MB  {ring_bytes / rows:>10.1f} B/entry")
+    print(f"  reduction: {dict_bytes / ring_bytes:.0f}x")
+
+
+def write_sample_log(log_file: str, rows: int):
+    rng = np.random.default_rng(0)
+    source_scales = rng.choice(['C', 'F', 'K'], rows)
+    target_scales = np.where(source_scales == 'C', 'F', 'C')
+    source_values = np.round(rng.uniform(0, 400, rows), 2)
+    timestamps = pd.Timestamp("2025-01-01") + pd.to_timedelta(np.arange(rows), unit='s')
+    pd.DataFrame({
+        'Timestamp': timestamps.strftime("%Y-%m-%d %H:%M:%S"),
+        'Source_Value': source_values,
+        'Source_Scale': source_scales,
+        'Target_Value': source_values,
+        'Target_Scale': target_scales,
+        'Conversion_Type': pd.Series(source_scales) + " to " + target_scales,
+    }).to_csv(log_file, index=False)
+
+
+def restore_with_iterrows(log_file: str):
+    logger = ConversionLogger(log_file)
+    df = pd.read_csv(log_file)
+    logger.restore_history({
+        'timestamp': row['Timestamp'],
+        'source_value': row['Source_Value'],
+        'source_scale': row['Source_Scale'],
+        'target_value': row['Target_Value'],
+        'target_scale': row['Target_Scale'],
+    } for _, row in df.iterrows())
+
+
+def restore_from_log(log_file: str):
+    ConversionLogger(log_file).restore_from_log()
+
+
+def bench_startup(sizes: tuple = (10_000, 100_000, 1_000_000)):
+    print("\nstartup history restore")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for rows in sizes:
+            log_file = os.path.join(tmp_dir, f"log_{rows}.csv")
+            write_sample_log(log_file, rows)
+            print(f" {rows:,} logged rows")
+
+            if rows <= 100_000:
+                print_result("iterrows replay", time_call(restore_with_iterrows, log_file, repeat=1), rows)
+            print_result("columnar restore", time_call(restore_from_log, log_file), rows)
+
+            logger = ConversionLogger(log_file)
+            logger.restore_from_log()
+            logger.save_snapshot()
+            print_result("snapshot restore", time_call(restore_from_log, log_file), rows)
+
+
+def bench_columnar_read(rows: int = 1_000_000):
+    print(f"\nlog read throughput ({rows:,} rows)")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_file = os.path.join(tmp_dir, "conversion_log.csv")
+        write_sample_log(log_file, rows)
+        store = ColumnarLog(os.path.join(tmp_dir, "conversion_log.columns"))
+        store.import_csv(log_file)
+        store.close()
+
+        print_result("pd.read_csv", time_call(pd.read_csv, log_file), rows)
+        print_result("ColumnarLog.to_dataframe", time_call(store.to_dataframe), rows)
+
+
+def bench_conversion_cache(rows: int = 200_000):
+    print(f"\nconvert with and without memoization ({rows:,} calls over hot values)")
+    hot_values = [(0, 'C', 'F'), (100, 'C', 'F'), (98.6, 'F', 'C'), (273.15, 'K', 'C'),
+                  (25, 'C', 'K'), (32, 'F', 'K')]
+    calls = [hot_values[i % len(hot_values)] for i in range(rows)]
+
+    for label, converter in [("uncached", TemperatureConverter(confirm=False)),
+                             ("lru cache (128)", TemperatureConverter(cache_size=128, confirm=False))]:
+        seconds = time_call(lambda: [converter.convert(*call) for call in calls])
+        print_result(label, seconds, rows)
+        if converter.cache_info() is not None:
+            info = converter.cache_info()
+            print(f"  hits: {info.hits:,}  misses: {info.misses:,}  size: {info.currsize}/{info.maxsize}")
+
+
+def bench_render_all(rows: int = 100_000):
+    print(f"\nchart rendering ({rows:,} rows, {os.cpu_count()} CPUs)")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_file = os.path.join(tmp_dir, "conversion_log.csv")
+        write_sample_log(log_file, rows)
+        analyzer = DataAnalyzer(log_file)
+        analyzer.load_data()
+
+        def sequential():
+            with redirect_stdout(io.StringIO()):
+                for method_name, filename in analyzer.CHARTS.values():
+                    getattr(analyzer, method_name)(os.path.join(tmp_dir, filename))
+
+        def parallel():
+            with redirect_stdout(io.StringIO()):
+                return analyzer.render_all(output_dir=tmp_dir)
+
+        print_result("sequential", time_call(sequential, repeat=1), rows)
+        print_result("render_all (process pool)", time_call(parallel, repeat=1), rows)
+        for chart, (_, seconds) in parallel().items():
+            print(f"    {chart:<24} {seconds * 1000:>10.2f} ms")
+
+        analyzer.chart_cache = ChartCache(os.path.join(tmp_dir, "chart_cache"))
+        parallel()
+        print_result("render_all (cached)", time_call(parallel), rows)
+        print(f"  cache: {analyzer.chart_cache.stats()}")
+
+
+def bench_streaming_analysis(rows: int = 1_000_000, chunksize: int = 100_000):
+    print(f"\nin-memory vs streaming analysis ({rows:,} rows, chunks of {chunksize:,})")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_file = os.path.join(tmp_dir, "conversion_log.csv")
+        write_sample_log(log_file, rows)
+
+        def in_memory():
+            analyzer = DataAnalyzer(log_file)
+            analyzer.load_data()
+            analyzer.analyze_conversion_frequency()
+            return analyzer.get_scale_summary()
+
+        def streaming():
+            return DataAnalyzer(log_file).analyze_streaming(chunksize=chunksize)
+
+        for label, func in [("in-memory", in_memory), ("streaming", streaming)]:
+            tracemalloc.start()
+            start = time.perf_counter()
+            func()
+            seconds = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print_result(label, seconds, rows)
+            print(f"    peak memory {peak / 1e6:>10.1f} MB")
+
+
+def bench_timeline_counts(rows: int = 1_000_000):
+    print(f"\ndaily timeline counts ({rows:,} rows)")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_file = os.path.join(tmp_dir, "conversion_log.csv")
+        write_sample_log(log_file, rows)
+        raw = pd.read_csv(log_file)
+        analyzer = DataAnalyzer(log_file)
+        analyzer.load_data()
+
+        def parse_and_group_by_date():
+            timestamps = pd.to_datetime(raw['Timestamp'])
+            return raw.groupby(timestamps.dt.date).size()
+
+        print_result("to_datetime + dt.date groupby", time_call(parse_and_group_by_date), rows)
+        for freq in ('D', 'h', 'min'):
+            print_result(f"resample_counts('{freq}')", time_call(analyzer.resample_counts, freq), rows)
+
+
+def bench_downsampled_timeline(rows: int = 1_000_000, max_points: int = 1000):
+    print(f"\nper-minute timeline chart ({rows:,} rows, LTTB to {max_points:,} points)")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_file = os.path.join(tmp_dir, "conversion_log.csv")
+        write_sample_log(log_file, rows)
+        analyzer = DataAnalyzer(log_file)
+        analyzer.load_data()
+        buckets = len(analyzer.resample_counts('min'))
+        output_file = os.path.join(tmp_dir, "timeline.png")
+
+        def render(points):
+            with redirect_stdout(io.StringIO()):
+                analyzer.create_timeline_chart(output_file, dpi=100, freq='min', max_points=points)
+
+        print_result(f"all {buckets:,} points", time_call(render, buckets, repeat=1), rows)
+        print_result(f"downsampled to {max_points:,}", time_call(render, max_points, repeat=1), rows)
+
+
+LEGACY_CONVERSIONS = {
+    ('C', 'F'): lambda c: (c * 9/5) + 32,
+    ('F', 'C'): lambda f: (f - 32) * 5/9,
+    ('C', 'K'): lambda c: c + 273.15,
+    ('K', 'C'): lambda k: k - 273.15,
+    ('F', 'K'): lambda f: (f - 32) * 5/9 + 273.15,
+    ('K', 'F'): lambda k: (k - 273.15) * 9/5 + 32,
+}
+
+
+class LegacyConverter:
+    """The baseline TemperatureConverter.convert body (minus its confirmation print)"""
+
+    celsius_to_fahrenheit = staticmethod(lambda c: (c * 9/5) + 32)
+    fahrenheit_to_celsius = staticmethod(lambda f: (f - 32) * 5/9)
+    celsius_to_kelvin = staticmethod(lambda c: c + 273.15)
+    kelvin_to_celsius = staticmethod(lambda k: k - 273.15)
+    fahrenheit_to_kelvin = staticmethod(lambda f: (f - 32) * 5/9 + 273.15)
+    kelvin_to_fahrenheit = staticmethod(lambda k: (k - 273.15) * 9/5 + 32)
+
+    def convert(self, value: float, from_scale: str, to_scale: str) -> float:
+        from_scale = from_scale.upper()
+        to_scale = to_scale.upper()
+
+        if from_scale == to_scale:
+            return round(value, 2)
+
+        conversion_map = {
+            ('C', 'F'): self.celsius_to_fahrenheit,
+            ('F', 'C'): self.fahrenheit_to_celsius,
+            ('C', 'K'): self.celsius_to_kelvin,
+            ('K', 'C'): self.kelvin_to_celsius,
+            ('F', 'K'): self.fahrenheit_to_kelvin,
+            ('K', 'F'): self.kelvin_to_fahrenheit,
+        }
+
+        conversion_func = conversion_map.get((from_scale, to_scale))
+        if conversion_func:
+            return round(conversion_func(value), 2)
+        else:
+            raise ValueError(f"Unsupported conversion: {from_scale} to {to_scale}")
+
+
+def legacy_convert_many(values, from_scale: str, to_scale: str) -> np.ndarray:
+    return np.round(LEGACY_CONVERSIONS[(from_scale, to_scale)](np.asarray(values, dtype=np.float64)), 2)
+
+
+def bench_affine_table(rows: int = 1_000_000, scalar_rows: int = 200_000):
+    print("\nper-conversion cost: lambda map vs affine table")
+    converter = TemperatureConverter(confirm=False)
+    pairs = list(LEGACY_CONVERSIONS)
+    values = np.random.default_rng(0).uniform(-50, 150, scalar_rows).tolist()
+    calls = [(value, *pairs[i % len(pairs)]) for i, value in enumerate(values)]
+
+    def affine_convert(value: float, from_scale: str, to_scale: str) -> float:
+        # TemperatureConverter.convert without the metrics and confirmation decorators
+        return converter._convert_value(value, from_scale.upper(), to_scale.upper())
+
+    def scalar(compute):
+        return [compute(*call) for call in calls]
+
+    for label, seconds in [("lambda map (scalar)", time_call(scalar, LegacyConverter().convert)),
+                           ("affine table (scalar)", time_call(scalar, affine_convert))]:
+        print_result(label, seconds, scalar_rows)
+        print(f"    {seconds / scalar_rows * 1e9:>10.1f} ns/conversion")
+
+    array = np.random.default_rng(0).uniform(-50, 150, rows)
+    for label, func in [("lambda map (vectorized)", legacy_convert_many),
+                        ("affine table (vectorized)", converter.convert_many)]:
+        seconds = time_call(func, array, 'F', 'K')
+        print_result(label, seconds, rows)
+        print(f"    {seconds / rows * 1e9:>10.2f} ns/conversion")
+
+
+def bench_metrics_overhead(calls: int = 500_000):
+    print(f"\ninstrumentation overhead ({calls:,} scalar conversions)")
+    converter = TemperatureConverter(confirm=False)
+
+    def run():
+        for _ in range(calls):
+            converter.convert(25.0, 'C', 'F')
+
+    disabled = time_call(run)
+    metrics.enable()
+    enabled = time_call(run)
+    metrics.disable()
+    metrics.reset()
+
+    print_result("metrics disabled", disabled, calls)
+    print_result("metrics enabled", enabled, calls)
+    print(f"  overhead when enabled: {(enabled - disabled) / calls * 1e9:.0f} ns/call")
+
+
+BENCHMARKS = {
+    'convert': bench_convert_many,
+    'validate': bench_validate_many,
+    'logging': bench_logging,
+    'history': bench_history_memory,
+    'startup': bench_startup,
+    'columnar': bench_columnar_read,
+    'cache': bench_conversion_cache,
+    'charts': bench_render_all,
+    'streaming': bench_streaming_analysis,
+    'timeline': bench_timeline_counts,
+    'downsample': bench_downsampled_timeline,
+    'affine': bench_affine_table,
+    'metrics': bench_metrics_overhead,
+}
+
+
+def main():
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name}. Choose from: {', '.join(BENCHMARKS)}")
+            continue
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,132 +1,913 @@
 from datetime import datetime
+from fractions import Fraction
+from functools import lru_cache
 from typing import Tuple, Optional
+import atexit
 import csv
 import os
+import queue
+import threading
+import time
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from log_storage import ColumnarLog, LogArchive
+from metrics import metrics
 
 
 def conversion_confirmation(func):
     def wrapper(self, value, *args, **kwargs):
         result = func(self, value, *args, **kwargs)
-        print(f"✓ Conversion confirmed: {value} → {result}")
+        if self.confirm:
+            print(f"✓ Conversion confirmed: {value} → {result}")
         return result
     return wrapper
 
 
+SCALE_TO_KELVIN = {
+    'C': (Fraction(1), Fraction('273.15')),
+    'F': (Fraction(5, 9), Fraction('459.67') * Fraction(5, 9)),
+    'K': (Fraction(1), Fraction(0)),
+    'R': (Fraction(5, 9), Fraction(0)),
+    'RE': (Fraction(5, 4), Fraction('273.15')),
+    'DE': (Fraction(-2, 3), Fraction('373.15')),
+}
+
+
+def compose_affine(from_scale: str, to_scale: str) -> Tuple[float, float]:
+    from_factor, from_offset = SCALE_TO_KELVIN[from_scale]
+    to_factor, to_offset = SCALE_TO_KELVIN[to_scale]
+    return float(from_factor / to_factor), float((from_offset - to_offset) / to_factor)
+
+
+AFFINE_TABLE = {(from_scale, to_scale): compose_affine(from_scale, to_scale)
+                for from_scale in SCALE_TO_KELVIN for to_scale in SCALE_TO_KELVIN}
+
+
 class ValidationHandler:
     
     MIN_TEMP_C = -273.15
     MAX_TEMP_C = 1000000
     
+    VALID = 0
+    INVALID_NUMBER = 1
+    INVALID_SCALE = 2
+    BELOW_ABSOLUTE_ZERO = 3
+    ABOVE_MAXIMUM = 4
+    
+    ERROR_MESSAGES = {
+        INVALID_NUMBER: "Invalid input: Temperature must be a number",
+        INVALID_SCALE: "Invalid scale: {scale}. Use "
+                       + ", ".join(f"'{scale}'" for scale in list(SCALE_TO_KELVIN)[:-1])
+                       + f", or '{list(SCALE_TO_KELVIN)[-1]}'",
+        BELOW_ABSOLUTE_ZERO: f"Temperature below absolute zero ({MIN_TEMP_C}°C)",
+        ABOVE_MAXIMUM: f"Temperature exceeds maximum limit ({MAX_TEMP_C}°C)",
+    }
+    
+    to_celsius = {scale: AFFINE_TABLE[(scale, 'C')] for scale in SCALE_TO_KELVIN}
+    
+    @staticmethod
+    def error_message(code: int, scale: str = '') -> Optional[str]:
+        if code == ValidationHandler.VALID:
+            return None
+        return ValidationHandler.ERROR_MESSAGES[code].format(scale=scale)
+    
+    @metrics.timed('validate.temperature')
     @staticmethod
     def validate_temperature(value: float, scale: str) -> Tuple[bool, Optional[str]]:
         try:
             value = float(value)
         except (ValueError, TypeError):
-            return False, "Invalid input: Temperature must be a number"
-        
-        if scale.upper() == 'C':
-            temp_c = value
-        elif scale.upper() == 'F':
-            temp_c = (value - 32) * 5/9
-        elif scale.upper() == 'K':
-            temp_c = value - 273.15
-        else:
-            return False, f"Invalid scale: {scale}. Use 'C', 'F', or 'K'"
+            return False, ValidationHandler.error_message(ValidationHandler.INVALID_NUMBER)
+        
+        to_celsius = ValidationHandler.to_celsius.get(scale.upper())
+        if to_celsius is None:
+            return False, ValidationHandler.error_message(ValidationHandler.INVALID_SCALE, scale)
+        factor, offset = to_celsius
+        temp_c = value * factor + offset
         
         if temp_c < ValidationHandler.MIN_TEMP_C:
-            return False, f"Temperature below absolute zero ({ValidationHandler.MIN_TEMP_C}°C)"
+            return False, ValidationHandler.error_message(ValidationHandler.BELOW_ABSOLUTE_ZERO)
         
         if temp_c > ValidationHandler.MAX_TEMP_C:
-            return False, f"Temperature exceeds maximum limit ({ValidationHandler.MAX_TEMP_C}°C)"
+            return False, ValidationHandler.error_message(ValidationHandler.ABOVE_MAXIMUM)
         
         return True, None
+    
+    @metrics.timed('validate.many')
+    @staticmethod
+    def validate_many(values, scales) -> Tuple[np.ndarray, np.ndarray]:
+        # atleast_1d: a scalar or 0-d input would otherwise break the masked assignments below
+        array = np.atleast_1d(np.asarray(values))
+        metrics.increment('validate.many.values', array.size)
+        if array.dtype.kind in 'biuf':
+            array = array.astype(np.float64, copy=False)
+        else:
+            array = pd.to_numeric(pd.Series(array, dtype=object), errors='coerce').to_numpy(dtype=np.float64)
+        
+        codes = np.zeros(array.shape, dtype=np.uint8)
+        temp_c = np.full(array.shape, np.nan)
+        
+        if isinstance(scales, str):
+            to_celsius = ValidationHandler.to_celsius.get(scales.upper())
+            if to_celsius is None:
+                codes[:] = ValidationHandler.INVALID_SCALE
+            else:
+                temp_c = array * to_celsius[0] + to_celsius[1]
+        else:
+            labels, unique_scales = pd.factorize(np.asarray(scales).ravel())
+            labels = labels.reshape(array.shape)
+            codes[:] = ValidationHandler.INVALID_SCALE
+            for label, scale in enumerate(unique_scales):
+                to_celsius = ValidationHandler.to_celsius.get(str(scale).upper())
+                if to_celsius is None:
+                    continue
+                scale_mask = labels == label
+                temp_c[scale_mask] = array[scale_mask] * to_celsius[0] + to_celsius[1]
+                codes[scale_mask] = ValidationHandler.VALID
+        
+        checked = codes == ValidationHandler.VALID
+        codes[checked & (temp_c < ValidationHandler.MIN_TEMP_C)] = ValidationHandler.BELOW_ABSOLUTE_ZERO
+        codes[checked & (temp_c > ValidationHandler.MAX_TEMP_C)] = ValidationHandler.ABOVE_MAXIMUM
+        codes[np.isnan(array)] = ValidationHandler.INVALID_NUMBER
+        
+        return codes == ValidationHandler.VALID, codes
 
 
 class TemperatureConverter:
     
-    celsius_to_fahrenheit = staticmethod(lambda c: (c * 9/5) + 32)
-    fahrenheit_to_celsius = staticmethod(lambda f: (f - 32) * 5/9)
-    celsius_to_kelvin = staticmethod(lambda c: c + 273.15)
-    kelvin_to_celsius = staticmethod(lambda k: k - 273.15)
-    fahrenheit_to_kelvin = staticmethod(lambda f: (f - 32) * 5/9 + 273.15)
-    kelvin_to_fahrenheit = staticmethod(lambda k: (k - 273.15) * 9/5 + 32)
+    SCALES = list(SCALE_TO_KELVIN)
+    conversion_table = AFFINE_TABLE
+    
+    def _get_conversion(self, from_scale: str, to_scale: str) -> Tuple[float, float]:
+        coefficients = self.conversion_table.get((from_scale, to_scale))
+        if coefficients is None:
+            raise ValueError(f"Unsupported conversion: {from_scale} to {to_scale}")
+        return coefficients
+    
+    def __init__(self, cache_size: int = 0, confirm: bool = True):
+        self.confirm = confirm
+        self.cache_size = cache_size
+        self._convert_value = self._compute
+        if cache_size:
+            self._convert_value = lru_cache(maxsize=cache_size, typed=True)(self._compute)
+    
+    def _compute(self, value: float, from_scale: str, to_scale: str) -> float:
+        # Scalar hot path: the table lookup is inlined rather than going through _get_conversion
+        coefficients = self.conversion_table.get((from_scale, to_scale))
+        if coefficients is None:
+            raise ValueError(f"Unsupported conversion: {from_scale} to {to_scale}")
+        return round(value * coefficients[0] + coefficients[1], 2)
     
+    @metrics.timed('convert.scalar')
     @conversion_confirmation
     def convert(self, value: float, from_scale: str, to_scale: str) -> float:
-        from_scale = from_scale.upper()
-        to_scale = to_scale.upper()
-        
-        if from_scale == to_scale:
-            return round(value, 2)
-        
-        conversion_map = {
-            ('C', 'F'): self.celsius_to_fahrenheit,
-            ('F', 'C'): self.fahrenheit_to_celsius,
-            ('C', 'K'): self.celsius_to_kelvin,
-            ('K', 'C'): self.kelvin_to_celsius,
-            ('F', 'K'): self.fahrenheit_to_kelvin,
-            ('K', 'F'): self.kelvin_to_fahrenheit,
-        }
+        return self._convert_value(value, from_scale.upper(), to_scale.upper())
+    
+    def cache_info(self):
+        if not self.cache_size:
+            return None
+        return self._convert_value.cache_info()
+    
+    def cache_clear(self):
+        if self.cache_size:
+            self._convert_value.cache_clear()
+    
+    @metrics.timed('convert.many')
+    def convert_many(self, values, from_scale: str, to_scale: str):
+        factor, offset = self._get_conversion(from_scale.upper(), to_scale.upper())
         
-        conversion_func = conversion_map.get((from_scale, to_scale))
-        if conversion_func:
-            return round(conversion_func(value), 2)
-        else:
-            raise ValueError(f"Unsupported conversion: {from_scale} to {to_scale}")
+        # atleast_1d: a scalar or 0-d input would otherwise give a numpy scalar, which round(out=) rejects
+        result = np.atleast_1d(np.asarray(values, dtype=np.float64)) * factor
+        result += offset
+        np.round(result, 2, out=result)
+        metrics.increment('convert.many.values', result.size)
+        
+        if isinstance(values, pd.Series):
+            return pd.Series(result, index=values.index, name=values.name)
+        return result
     
     def convert_to_all(self, value: float, from_scale: str) -> dict:
         from_scale = from_scale.upper()
-        scales = ['C', 'F', 'K']
         results = {}
         
-        for scale in scales:
+        for scale in self.SCALES:
             if scale != from_scale:
                 results[scale] = self.convert(value, from_scale, scale)
         
         return results
 
 
+class ConversionHistory:
+    
+    INITIAL_SIZE = 1024
+    
+    def __init__(self, capacity: int = 100000):
+        self.capacity = capacity
+        self._scales = []
+        self._scale_codes = {}
+        self._allocate(min(capacity, self.INITIAL_SIZE))
+        self._start = 0
+        self._size = 0
+    
+    def _allocate(self, size: int):
+        self._timestamps = np.zeros(size, dtype='datetime64[s]')
+        self._source_values = np.zeros(size, dtype=np.float64)
+        self._target_values = np.zeros(size, dtype=np.float64)
+        self._source_scales = np.zeros(size, dtype=np.uint8)
+        self._target_scales = np.zeros(size, dtype=np.uint8)
+    
+    def _columns(self) -> tuple:
+        return (self._timestamps, self._source_values, self._source_scales,
+                self._target_values, self._target_scales)
+    
+    def _grow(self, minimum: int = 0):
+        size = min(self.capacity, max(len(self._timestamps) * 2, minimum))
+        old_columns = self._columns()
+        self._allocate(size)
+        for new, old in zip(self._columns(), old_columns):
+            new[:len(old)] = old
+    
+    def _scale_code(self, scale: str) -> int:
+        code = self._scale_codes.get(scale)
+        if code is None:
+            code = len(self._scales)
+            self._scales.append(scale)
+            self._scale_codes[scale] = code
+        return code
+    
+    def add(self, timestamp: str, source_value: float, source_scale: str,
+            target_value: float, target_scale: str):
+        if self._size == len(self._timestamps) and self._size < self.capacity:
+            self._grow()
+        
+        if self._size < self.capacity:
+            index = self._size
+            self._size += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % self.capacity
+        
+        self._timestamps[index] = np.datetime64(str(timestamp).replace(' ', 'T'), 's')
+        self._source_values[index] = source_value
+        self._source_scales[index] = self._scale_code(source_scale)
+        self._target_values[index] = target_value
+        self._target_scales[index] = self._scale_code(target_scale)
+    
+    def append(self, entry: dict):
+        self.add(entry['timestamp'], entry['source_value'], entry['source_scale'],
+                 entry['target_value'], entry['target_scale'])
+    
+    def extend(self, timestamps, source_values, source_scales, target_values, target_scales):
+        columns = [np.asarray(column) for column in
+                   (timestamps, source_values, source_scales, target_values, target_scales)]
+        count = min(len(columns[0]), self.capacity)
+        if count == 0:
+            return
+        timestamps, source_values, source_scales, target_values, target_scales = (
+            column[len(column) - count:] for column in columns)
+        
+        needed = min(self._size + count, self.capacity)
+        if needed > len(self._timestamps):
+            self._grow(needed)
+        
+        indices = (self._start + self._size + np.arange(count)) % len(self._timestamps)
+        self._timestamps[indices] = timestamps.astype('datetime64[s]')
+        self._source_values[indices] = source_values
+        self._source_scales[indices] = self._scale_codes_for(source_scales)
+        self._target_values[indices] = target_values
+        self._target_scales[indices] = self._scale_codes_for(target_scales)
+        
+        overflow = self._size + count - self.capacity
+        if overflow > 0:
+            self._start = (self._start + overflow) % self.capacity
+        self._size = needed
+    
+    def _scale_codes_for(self, scales: np.ndarray) -> np.ndarray:
+        labels, unique_scales = pd.factorize(scales)
+        lookup = np.array([self._scale_code(str(scale)) for scale in unique_scales], dtype=np.uint8)
+        return lookup[labels]
+    
+    def columns(self) -> dict:
+        indices = (self._start + np.arange(self._size)) % len(self._timestamps)
+        scales = np.array(self._scales, dtype=object)
+        return {
+            'timestamps': self._timestamps[indices],
+            'source_values': self._source_values[indices],
+            'source_scales': scales[self._source_scales[indices]],
+            'target_values': self._target_values[indices],
+            'target_scales': scales[self._target_scales[indices]],
+        }
+    
+    def _entries(self, positions: range) -> list:
+        if not positions:
+            return []
+        indices = (self._start + np.arange(positions.start, positions.stop, positions.step)) % len(self._timestamps)
+        timestamps = np.datetime_as_string(self._timestamps[indices], unit='s')
+        
+        entries = []
+        for timestamp, source_value, source_code, target_value, target_code in zip(
+                timestamps.tolist(), self._source_values[indices].tolist(),
+                self._source_scales[indices].tolist(), self._target_values[indices].tolist(),
+                self._target_scales[indices].tolist()):
+            source_scale = self._scales[source_code]
+            target_scale = self._scales[target_code]
+            entries.append({
+                'timestamp': timestamp.replace('T', ' '),
+                'source_value': source_value,
+                'source_scale': source_scale,
+                'target_value': target_value,
+                'target_scale': target_scale,
+                'conversion_type': f"{source_scale} to {target_scale}"
+            })
+        return entries
+    
+    def tail(self, limit: int) -> list:
+        return self._entries(range(max(self._size - limit, 0), self._size))
+    
+    def clear(self):
+        self._allocate(min(self.capacity, self.INITIAL_SIZE))
+        self._start = 0
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self._entries(range(self._size)[key])
+        position = range(self._size)[key]
+        return self._entries(range(position, position + 1))[0]
+    
+    def __iter__(self):
+        return iter(self._entries(range(self._size)))
+    
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self._columns())
+
+
+class RunningMoments:
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+    
+    def update(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+    
+    def merge(self, count: int, mean: float, m2: float):
+        count = int(count)
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+    
+    def update_many(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        mean = float(values.mean())
+        self.merge(len(values), mean, float(((values - mean) ** 2).sum()))
+    
+    def state(self) -> list:
+        return [self.count, self.mean, self._m2]
+    
+    @property
+    def variance(self) -> float:
+        if self.count < 2:
+            return 0.0
+        return self._m2 / (self.count - 1)
+    
+    @property
+    def std(self) -> float:
+        return self.variance ** 0.5
+
+
+class RunningStatistics:
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        self.conversion_counts = {}
+        self.source = RunningMoments()
+        self.target = RunningMoments()
+    
+    @property
+    def count(self) -> int:
+        return self.source.count
+    
+    def update(self, conversion_type: str, source_value: float, target_value: float):
+        self.conversion_counts[conversion_type] = self.conversion_counts.get(conversion_type, 0) + 1
+        self.source.update(float(source_value))
+        self.target.update(float(target_value))
+    
+    def update_many(self, conversion_types, source_values, target_values):
+        labels, unique_types = pd.factorize(np.asarray(conversion_types))
+        for conversion_type, count in zip(unique_types, np.bincount(labels[labels >= 0]).tolist()):
+            conversion_type = str(conversion_type)
+            self.conversion_counts[conversion_type] = self.conversion_counts.get(conversion_type, 0) + count
+        self.source.update_many(source_values)
+        self.target.update_many(target_values)
+
+
 class ConversionLogger:
     
-    def __init__(self, log_file: str = "conversion_log.csv"):
+    COLUMNS = ['Timestamp', 'Source_Value', 'Source_Scale',
+               'Target_Value', 'Target_Scale', 'Conversion_Type']
+    
+    def __init__(self, log_file: str = "conversion_log.csv", buffered: bool = False,
+                 buffer_size: int = 1000, flush_interval: float = 1.0, fsync: bool = False,
+                 history_capacity: int = 100000, columnar_log: str = None,
+                 rotate: str = None, max_bytes: int = None, background: bool = False,
+                 queue_size: int = 10000):
         self.log_file = log_file
-        self.history = []
-        self._initialize_log_file()
+        self.snapshot_file = os.path.splitext(log_file)[0] + ".snapshot.npz"
+        self._in_sync_with_log = not os.path.exists(log_file)
+        self.archive = LogArchive(log_file)
+        self.rotate = rotate
+        self.max_bytes = max_bytes
+        with self.archive.locked():
+            self._initialize_log_file()
+            self._log_state = self._stat_log()
+        active_range = LogArchive.read_time_range(log_file)
+        self._active_date = active_range[0][:10] if active_range else None
+        self.history = ConversionHistory(history_capacity)
+        self.statistics = RunningStatistics()
+        self.buffered = buffered
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._buffer = []
+        self._file = None
+        self._writer = None
+        self._last_flush = time.monotonic()
+        # Reentrant: the flusher thread may rotate, and rotation flushes
+        self._lock = threading.RLock()
+        
+        self.columnar = None
+        if columnar_log is not None:
+            self.columnar = ColumnarLog(columnar_log)
+            if len(self.columnar) == 0:
+                self.columnar.import_csv(self.log_file)
+        
+        self._queue = None
+        self._writer_thread = None
+        self._writer_error = None
+        self._staged = []
+        self._staged_timestamp = None
+        self._staged_since = None
+        if background:
+            self._queue = queue.Queue(maxsize=queue_size)
+            self.write_latency = RunningMoments()
+            self._max_write_latency = 0.0
+            self._max_queue_depth = 0
+            self._blocked_seconds = 0.0
+            self._rows_written = 0
+            self._writer_thread = threading.Thread(target=self._drain_queue, daemon=True,
+                                                   name="ConversionLogger-writer")
+            self._writer_thread.start()
+        
+        if self.buffered or background:
+            with self.archive.locked():
+                self._initialize_log_file()
+                self._file = open(self.log_file, 'a', newline='')
+            self._writer = csv.writer(self._file)
+            atexit.register(self.close)
+        
+        # The writer thread flushes after every batch; a plain buffered logger needs its own
+        # thread so rows don't wait in memory for the next write once logging goes quiet
+        self._flusher = None
+        self._stop_flusher = threading.Event()
+        if self.buffered and not background:
+            self._flusher = threading.Thread(target=self._flush_periodically, daemon=True,
+                                             name="ConversionLogger-flusher")
+            self._flusher.start()
+    
+    def _stat_log(self) -> tuple:
+        state = os.stat(self.log_file)
+        return state.st_ino, state.st_size
+    
+    @staticmethod
+    def _file_state(f) -> tuple:
+        state = os.fstat(f.fileno())
+        return state.st_ino, state.st_size
+    
+    def _claim_log(self):
+        # Called under the archive lock before appending. Other processes may share this log:
+        # if it changed since our last write, history no longer covers it (so no snapshots until
+        # the next restore), and if it was rotated our open file now points into the archive.
+        try:
+            state = self._stat_log()
+        except FileNotFoundError:
+            self._initialize_log_file()
+            state = self._stat_log()
+        if state == self._log_state:
+            return
+        self._in_sync_with_log = False
+        if self._file is not None and self._file_state(self._file)[0] != state[0]:
+            self._file.close()
+            self._file = open(self.log_file, 'a', newline='')
+            self._writer = csv.writer(self._file)
     
     def _initialize_log_file(self):
         if not os.path.exists(self.log_file):
             with open(self.log_file, 'w', newline='') as f:
                 writer = csv.writer(f)
-                writer.writerow(['Timestamp', 'Source_Value', 'Source_Scale', 
-                               'Target_Value', 'Target_Scale', 'Conversion_Type'])
+                writer.writerow(self.COLUMNS)
     
+    @metrics.timed('log.conversion')
     def log_conversion(self, source_value: float, source_scale: str,
                       target_value: float, target_scale: str):
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         conversion_type = f"{source_scale} to {target_scale}"
         
-        entry = {
-            'timestamp': timestamp,
-            'source_value': source_value,
-            'source_scale': source_scale,
-            'target_value': target_value,
-            'target_scale': target_scale,
-            'conversion_type': conversion_type
+        row = [timestamp, source_value, source_scale,
+               target_value, target_scale, conversion_type]
+        
+        with self._lock:
+            self._rotate_before_write(timestamp)
+            self.history.add(timestamp, source_value, source_scale, target_value, target_scale)
+            self.statistics.update(conversion_type, source_value, target_value)
+            self._write_rows(timestamp, [row])
+    
+    @metrics.timed('log.many')
+    def log_many(self, source_values, source_scales, target_values, target_scales):
+        source_values = np.asarray(source_values, dtype=np.float64)
+        target_values = np.asarray(target_values, dtype=np.float64)
+        if len(source_values) == 0:
+            return
+        metrics.increment('log.many.rows', len(source_values))
+        source_scales = np.broadcast_to(np.asarray(source_scales, dtype=object), source_values.shape)
+        target_scales = np.broadcast_to(np.asarray(target_scales, dtype=object), source_values.shape)
+        
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        conversion_types = (pd.Series(source_scales, dtype=object) + " to "
+                            + pd.Series(target_scales, dtype=object)).to_numpy()
+        
+        rows = [[timestamp, *row] for row in zip(source_values.tolist(), source_scales.tolist(),
+                                                 target_values.tolist(), target_scales.tolist(),
+                                                 conversion_types.tolist())]
+        
+        with self._lock:
+            self._rotate_before_write(timestamp)
+            self.history.extend(np.full(source_values.shape, np.datetime64(timestamp.replace(' ', 'T'), 's')),
+                                source_values, source_scales, target_values, target_scales)
+            self.statistics.update_many(conversion_types, source_values, target_values)
+            self._write_rows(timestamp, rows)
+    
+    def _rotate_before_write(self, timestamp: str):
+        # A rotation snapshots history, so it must run before the new rows are added to it
+        if self._writer_thread is None:
+            self._rotate_for(timestamp)
+    
+    def _rotate_for(self, timestamp: str):
+        if self.rotate == 'daily' and self._active_date not in (None, timestamp[:10]):
+            with self.archive.locked():
+                # Another process writing this log may already have started the new day
+                self._flush_buffer()
+                active_range = LogArchive.read_time_range(self.log_file)
+                if active_range is not None and active_range[0][:10] != timestamp[:10]:
+                    self.rotate_log()
+                else:
+                    self._active_date = None
+        self._active_date = self._active_date or timestamp[:10]
+    
+    def _write_rows(self, timestamp: str, rows: list):
+        if self._writer_thread is None:
+            self._write_to_disk(timestamp, rows)
+            return
+        
+        self._raise_writer_error()
+        # Coalesce rows on the caller's side: one queue item (and one writer wake-up) per
+        # buffer_size rows instead of per row. An item keeps a single timestamp for rotation.
+        if self._staged and timestamp != self._staged_timestamp:
+            self._enqueue_staged()
+        if not self._staged:
+            self._staged_timestamp = timestamp
+            self._staged_since = time.perf_counter()
+        self._staged.extend(rows)
+        if len(self._staged) >= self.buffer_size:
+            self._enqueue_staged()
+    
+    def _enqueue_staged(self):
+        item = (self._staged_timestamp, self._staged, self._staged_since)
+        self._staged = []
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            blocked_since = time.perf_counter()
+            self._queue.put(item)
+            self._blocked_seconds += time.perf_counter() - blocked_since
+        self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+    
+    def _hand_over_staged(self):
+        with self._lock:
+            if self._staged:
+                self._enqueue_staged()
+    
+    def _drain_queue(self):
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                # Logging went quiet: take over what callers staged. Never wait for the lock,
+                # a caller holding it may itself be waiting for room in the queue.
+                if self._lock.acquire(blocking=False):
+                    try:
+                        if self._staged:
+                            self._enqueue_staged()
+                    finally:
+                        self._lock.release()
+                continue
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stop = False
+            try:
+                for item in batch:
+                    if item is None:
+                        stop = True
+                        continue
+                    if self._writer_error is None:
+                        self._write_to_disk(item[0], item[1])
+                if self._writer_error is None:
+                    self._flush_buffer()
+                    self._check_size()
+            except Exception as e:
+                self._writer_error = e
+            
+            written_at = time.perf_counter()
+            for item in batch:
+                if item is not None:
+                    latency = written_at - item[2]
+                    self.write_latency.update(latency)
+                    metrics.observe('log.write_latency', latency)
+                    self._max_write_latency = max(self._max_write_latency, latency)
+                    self._rows_written += len(item[1])
+                self._queue.task_done()
+            if stop:
+                return
+    
+    def _flush_periodically(self):
+        timeout = self.flush_interval
+        while not self._stop_flusher.wait(timeout):
+            with self._lock:
+                if self._file is None:
+                    return
+                if self._buffer and time.monotonic() - self._last_flush >= self.flush_interval:
+                    self._flush_buffer()
+                    self._check_size()
+                # Wake when the last flush turns flush_interval old; rows arriving after that flush themselves
+                timeout = self._last_flush + self.flush_interval - time.monotonic()
+                if timeout <= 0:
+                    timeout = self.flush_interval
+    
+    def _raise_writer_error(self):
+        if self._writer_error is not None:
+            raise RuntimeError(f"Background log writer failed: {self._writer_error}") from self._writer_error
+    
+    def queue_stats(self) -> Optional[dict]:
+        if self._queue is None:
+            return None
+        
+        return {
+            'depth': self._queue.qsize(),
+            'max_depth': self._max_queue_depth,
+            'capacity': self._queue.maxsize,
+            'rows_written': self._rows_written,
+            'writes': self.write_latency.count,
+            'mean_write_latency': self.write_latency.mean,
+            'max_write_latency': self._max_write_latency,
+            'blocked_seconds': self._blocked_seconds,
         }
-        self.history.append(entry)
+    
+    def _write_to_disk(self, timestamp: str, rows: list):
+        self._rotate_for(timestamp)
+        
+        if self._file is not None:
+            self._buffer.extend(rows)
+            if (len(self._buffer) >= self.buffer_size
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush_buffer()
+                self._check_size()
+            return
+        
+        with self.archive.locked():
+            self._claim_log()
+            with open(self.log_file, 'a', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerows(rows)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+                self._log_state = self._file_state(f)
         
-        with open(self.log_file, 'a', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow([timestamp, source_value, source_scale,
-                           target_value, target_scale, conversion_type])
+        if self.columnar is not None:
+            self.columnar.append_rows([row[:5] for row in rows])
+            self.columnar.flush(self.fsync)
+        self._check_size()
     
-    def get_history(self, limit: int = None) -> list:
+    def _check_size(self):
+        if self.max_bytes is None:
+            return
+        with self.archive.locked():
+            if os.path.getsize(self.log_file) >= self.max_bytes:
+                self.rotate_log()
+    
+    def rotate_log(self):
+        with self.archive.locked():
+            self._claim_log()
+            buffered = self._file is not None
+            if buffered:
+                self._flush_buffer()
+                self._file.close()
+            
+            if self.archive.archive_active_log() is not None:
+                self._initialize_log_file()
+                self._active_date = None
+            self._log_state = self._stat_log()
+            
+            if buffered:
+                self._file = open(self.log_file, 'a', newline='')
+                self._writer = csv.writer(self._file)
+        
+        if threading.current_thread() is not self._writer_thread:
+            self.save_snapshot()
+    
+    @metrics.timed('log.flush')
+    def flush(self):
+        if self._writer_thread is not None:
+            self._hand_over_staged()
+            self._queue.join()
+            self._raise_writer_error()
+            return
+        with self._lock:
+            self._flush_buffer()
+    
+    def _flush_buffer(self):
+        if self._file is None:
+            return
+        
+        with self.archive.locked():
+            self._claim_log()
+            if self._buffer:
+                self._writer.writerows(self._buffer)
+                if self.columnar is not None:
+                    self.columnar.append_rows([row[:5] for row in self._buffer])
+                self._buffer.clear()
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._log_state = self._file_state(self._file)
+        if self.columnar is not None:
+            self.columnar.flush(self.fsync)
+        self._last_flush = time.monotonic()
+    
+    def close(self):
+        if self._flusher is not None:
+            self._stop_flusher.set()
+            self._flusher.join()
+            self._flusher = None
+        
+        if self._writer_thread is not None:
+            self._hand_over_staged()
+            self._queue.put(None)
+            self._writer_thread.join()
+            self._writer_thread = None
+        
+        if self._file is not None:
+            self._flush_buffer()
+            self._file.close()
+            self._file = None
+            self._writer = None
+            atexit.unregister(self.close)
+        
+        if self.columnar is not None:
+            self.columnar.close()
+        self.archive.close()
+        self._raise_writer_error()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def get_history(self, limit: int = None):
         if limit:
-            return self.history[-limit:]
+            return self.history.tail(limit)
         return self.history
     
+    def restore_history(self, entries):
+        for entry in entries:
+            self.history.append(entry)
+            self.statistics.update(f"{entry['source_scale']} to {entry['target_scale']}",
+                                   entry['source_value'], entry['target_value'])
+    
+    def restore_from_log(self):
+        self.flush()
+        with self.archive.locked():
+            self.history.clear()
+            self.statistics.reset()
+            
+            offset = 0
+            if os.path.exists(self.snapshot_file):
+                offset = self._load_snapshot()
+            
+            if offset == 0:
+                for partition_file in self.archive.select():
+                    if partition_file != self.log_file:
+                        self._restore_columns(pd.read_csv(partition_file))
+            
+            if os.path.getsize(self.log_file) > offset:
+                with open(self.log_file, 'rb') as f:
+                    f.seek(offset)
+                    df = pd.read_csv(f, header=0 if offset == 0 else None, names=self.COLUMNS)
+                self._restore_columns(df)
+            
+            self._in_sync_with_log = True
+            self._log_state = self._stat_log()
+    
+    def _load_snapshot(self) -> int:
+        try:
+            with np.load(self.snapshot_file) as snapshot:
+                offset = int(snapshot['log_offset'])
+                if (offset > os.path.getsize(self.log_file)
+                        or int(snapshot['log_generation']) != len(self.archive)):
+                    return 0
+                
+                self.history.extend(snapshot['timestamps'], snapshot['source_values'],
+                                    snapshot['source_scales'], snapshot['target_values'],
+                                    snapshot['target_scales'])
+                for conversion_type, count in zip(snapshot['conversion_types'].tolist(),
+                                                  snapshot['conversion_counts'].tolist()):
+                    self.statistics.conversion_counts[conversion_type] = count
+                self.statistics.source.merge(*snapshot['source_moments'].tolist())
+                self.statistics.target.merge(*snapshot['target_moments'].tolist())
+                return offset
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+            print(f"Ignoring unreadable snapshot {self.snapshot_file}: {e}")
+            self.history.clear()
+            self.statistics.reset()
+            return 0
+    
+    def _restore_columns(self, df: pd.DataFrame):
+        if df.empty:
+            return
+        timestamps = pd.to_datetime(df['Timestamp'], format="%Y-%m-%d %H:%M:%S")
+        self.history.extend(timestamps.to_numpy(), df['Source_Value'].to_numpy(),
+                            df['Source_Scale'].to_numpy(), df['Target_Value'].to_numpy(),
+                            df['Target_Scale'].to_numpy())
+        self.statistics.update_many(df['Conversion_Type'].to_numpy(),
+                                    df['Source_Value'].to_numpy(),
+                                    df['Target_Value'].to_numpy())
+    
+    def save_snapshot(self) -> bool:
+        if not self._in_sync_with_log:
+            return False
+        
+        self.flush()
+        with self.archive.locked():
+            if self._stat_log() != self._log_state:
+                # Another process appended to the log since our last write
+                self._in_sync_with_log = False
+                return False
+            columns = self.history.columns()
+            conversion_counts = self.statistics.conversion_counts
+            # Write beside the snapshot and swap it in, so an interrupted save never leaves a truncated file
+            with open(self.snapshot_file + ".tmp", 'wb') as f:
+                np.savez(f,
+                         log_offset=os.path.getsize(self.log_file),
+                         log_generation=len(self.archive),
+                         timestamps=columns['timestamps'],
+                         source_values=columns['source_values'],
+                         source_scales=columns['source_scales'].astype(str),
+                         target_values=columns['target_values'],
+                         target_scales=columns['target_scales'].astype(str),
+                         conversion_types=np.array(list(conversion_counts), dtype=str),
+                         conversion_counts=np.array(list(conversion_counts.values()), dtype=np.int64),
+                         source_moments=np.array(self.statistics.source.state()),
+                         target_moments=np.array(self.statistics.target.state()))
+            os.replace(self.snapshot_file + ".tmp", self.snapshot_file)
+        return True
+    
     def clear_history(self):
-        self.history = []
+        self.history.clear()
+        self.statistics.reset()
+        self._in_sync_with_log = False
 
 
 class Report:
@@ -134,36 +915,31 @@ class Report:
     def __init__(self, logger: ConversionLogger):
         self.logger = logger
     
+    @metrics.timed('report.statistics')
     def generate_statistics(self) -> dict:
-        history = self.logger.get_history()
+        statistics = self.logger.statistics
         
-        if not history:
+        if not statistics.count:
             return {
                 'total_conversions': 0,
                 'most_common': 'N/A',
                 'average_source': 0,
                 'average_target': 0
             }
-        conversion_counts = {}
-        source_values = []
-        target_values = []
-        
-        for entry in history:
-            conv_type = entry['conversion_type']
-            conversion_counts[conv_type] = conversion_counts.get(conv_type, 0) + 1
-            source_values.append(entry['source_value'])
-            target_values.append(entry['target_value'])
         
-        most_common = max(conversion_counts.items(), key=lambda x: x[1])
+        most_common = max(statistics.conversion_counts.items(), key=lambda x: x[1])
         
         return {
-            'total_conversions': len(history),
+            'total_conversions': statistics.count,
             'most_common': f"{most_common[0]} ({most_common[1]} times)",
-            'average_source': round(sum(source_values) / len(source_values), 2),
-            'average_target': round(sum(target_values) / len(target_values), 2),
-            'conversion_counts': conversion_counts
+            'average_source': round(statistics.source.mean, 2),
+            'average_target': round(statistics.target.mean, 2),
+            'std_source': round(statistics.source.std, 2),
+            'std_target': round(statistics.target.std, 2),
+            'conversion_counts': dict(statistics.conversion_counts)
         }
     
+    @metrics.timed('report.save')
     def save_report(self, filename: str = "statistics_report.txt"):
         stats = self.generate_statistics()
         
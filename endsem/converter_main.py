@@ -4,8 +4,15 @@ from converter_class import (
     ValidationHandler, 
     Report
 )
-from logger import DataAnalyzer
+from logger import DataAnalyzer, ChartCache
+from metrics import metrics
+import argparse
+import atexit
 import sys
+import time
+
+import numpy as np
+import pandas as pd
 
 
 def print_header():
@@ -38,7 +45,7 @@ def get_temperature_input():
         print("❌ Invalid input: Please enter a numeric value")
         return None, None
     
-    scale = input("Scale (C/F/K): ").strip().upper()
+    scale = input(f"Scale ({'/'.join(TemperatureConverter.SCALES)}): ").strip().upper()
     
     is_valid, error_msg = ValidationHandler.validate_temperature(value, scale)
     if not is_valid:
@@ -66,8 +73,8 @@ def convert_temperature(converter, logger):
     choice = input("\nChoice (1/2): ").strip()
     
     if choice == '1':
-        target_scale = input("Target scale (C/F/K): ").strip().upper()
-        if target_scale not in ['C', 'F', 'K']:
+        target_scale = input(f"Target scale ({'/'.join(TemperatureConverter.SCALES)}): ").strip().upper()
+        if target_scale not in TemperatureConverter.SCALES:
             print("❌ Invalid scale")
             return
         
@@ -167,9 +174,7 @@ def create_visualizations(analyzer):
         elif choice == '3':
             analyzer.create_timeline_chart()
         elif choice == '4':
-            analyzer.create_frequency_chart()
-            analyzer.create_temperature_distribution_chart()
-            analyzer.create_timeline_chart()
+            analyzer.render_all()
             print("✓ All charts created")
         else:
             print("❌ Invalid choice")
@@ -182,7 +187,7 @@ def run_demo():
     print("RUNNING DEMONSTRATION")
     print("=" * 60)
     
-    converter = TemperatureConverter()
+    converter = TemperatureConverter(cache_size=128, confirm=False)
     logger = ConversionLogger()
     
     demo_conversions = [
@@ -206,36 +211,123 @@ def run_demo():
     report.display_summary()
     report.save_report()
     
-    analyzer = DataAnalyzer()
+    analyzer = DataAnalyzer(chart_cache=ChartCache())
     analyzer.load_data()
-    analyzer.create_frequency_chart()
-    analyzer.create_temperature_distribution_chart()
+    analyzer.render_all(['frequency', 'distribution'])
     
     print("\n✓ Demo completed successfully!")
 
 
+def run_stream(args):
+    converter = TemperatureConverter(confirm=False)
+    logger = ConversionLogger(buffered=True) if args.log else None
+    to_scale = args.to_scale.upper()
+    from_scale = args.from_scale.upper()
+    for option, scale in (('--from', from_scale), ('--to', to_scale)):
+        if scale not in TemperatureConverter.SCALES:
+            sys.exit(f"Unsupported scale for {option}: {scale} (choose from {', '.join(TemperatureConverter.SCALES)})")
+    
+    source = sys.stdin if args.input == '-' else args.input
+    chunks = pd.read_csv(source, header=None, names=['value', 'scale'], dtype=str,
+                         chunksize=args.chunk_size, skipinitialspace=True, skip_blank_lines=False)
+    
+    start = time.perf_counter()
+    converted = 0
+    rejected = 0
+    
+    for chunk in chunks:
+        # Blank lines are kept while parsing so the index stays the input line number
+        chunk = chunk.dropna(how='all')
+        if chunk.empty:
+            continue
+        
+        values = chunk['value'].to_numpy()
+        if chunk['scale'].isna().all():
+            scales = np.full(len(chunk), from_scale, dtype=object)
+            valid, codes = ValidationHandler.validate_many(values, from_scale)
+        else:
+            labels, unique_scales = pd.factorize(chunk['scale'].fillna(from_scale))
+            scales = np.array([scale.strip().upper() for scale in unique_scales], dtype=object)[labels]
+            valid, codes = ValidationHandler.validate_many(values, scales)
+        
+        for line, code, scale in zip(chunk.index[~valid], codes[~valid], scales[~valid]):
+            print(f"Line {line + 1}: {ValidationHandler.error_message(code, scale)}", file=sys.stderr)
+        rejected += int((~valid).sum())
+        
+        source_values = pd.to_numeric(values[valid]).astype(np.float64)
+        source_scales = scales[valid]
+        results = np.empty(len(source_values))
+        for scale in pd.unique(source_scales):
+            mask = source_scales == scale
+            results[mask] = converter.convert_many(source_values[mask], scale, to_scale)
+        
+        sys.stdout.writelines(
+            f"{value},{scale},{result},{to_scale}\n"
+            for value, scale, result in zip(source_values.tolist(), source_scales.tolist(), results.tolist()))
+        if logger is not None:
+            logger.log_many(source_values, source_scales, results, to_scale)
+        converted += len(source_values)
+    
+    if logger is not None:
+        logger.close()
+    
+    elapsed = time.perf_counter() - start
+    rate = converted / elapsed if elapsed > 0 else 0
+    print(f"Converted {converted} rows ({rejected} rejected) in {elapsed:.2f}s "
+          f"({rate:,.0f} rows/s)", file=sys.stderr)
+
+
+def run_server(args):
+    from converter_server import main as serve
+    serve(['--host', args.host, '--port', str(args.port)] + ([] if args.log else ['--no-log'])
+          + (['--metrics'] if args.metrics else []))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Temperature converter with logging")
+    parser.add_argument('--demo', action='store_true', help="run the automated demonstration")
+    parser.add_argument('--stream', action='store_true',
+                        help="convert values read line by line ('value' or 'value,scale') and write CSV to stdout")
+    parser.add_argument('--from', dest='from_scale', default='C',
+                        help="scale of values without one (default: C)")
+    parser.add_argument('--to', dest='to_scale', default='F', help="target scale (default: F)")
+    parser.add_argument('--input', default='-', help="input file for --stream (default: stdin)")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="rows converted per chunk")
+    parser.add_argument('--serve', action='store_true', help="serve batch conversions over HTTP (requires Flask)")
+    parser.add_argument('--host', default='127.0.0.1', help="interface for --serve (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=5050, help="port for --serve (default: 5050)")
+    parser.add_argument('--log', action='store_true',
+                        help="log streamed or served conversions to conversion_log.csv")
+    parser.add_argument('--metrics', action='store_true',
+                        help="record call counts and latencies and print them to stderr on exit")
+    return parser.parse_args(argv)
+
+
 def main():
-    converter = TemperatureConverter()
-    logger = ConversionLogger()
-    analyzer = DataAnalyzer()
-    
-    if analyzer.load_data():
-        df = analyzer.get_dataframe()
-        if df is not None and not df.empty:
-            for _, row in df.iterrows():
-                logger.history.append({
-                    'timestamp': row['Timestamp'],
-                    'source_value': row['Source_Value'],
-                    'source_scale': row['Source_Scale'],
-                    'target_value': row['Target_Value'],
-                    'target_scale': row['Target_Scale'],
-                    'conversion_type': row['Conversion_Type']
-                })
+    args = parse_args()
+    
+    if args.metrics:
+        metrics.enable()
+        atexit.register(lambda: print(metrics.report(), file=sys.stderr))
+    
+    if args.stream:
+        run_stream(args)
+        return
+    
+    if args.serve:
+        run_server(args)
+        return
+    
+    converter = TemperatureConverter(cache_size=128)
+    logger = ConversionLogger(background=True)
+    analyzer = DataAnalyzer(chart_cache=ChartCache())
+    
+    logger.restore_from_log()
     
     print_header()
     print("\nWelcome to the Temperature Converter!")
     
-    if len(sys.argv) > 1 and sys.argv[1] == '--demo':
+    if args.demo:
         run_demo()
         return
     
@@ -252,8 +344,10 @@ def main():
         elif choice == '4':
             generate_reports(logger)
         elif choice == '5':
+            logger.flush()
             create_visualizations(analyzer)
         elif choice == '6':
+            logger.save_snapshot()
             print("\n" + "=" * 60)
             print("Thank you for using Temperature Converter!")
             print("=" * 60 + "\n")
@@ -0,0 +1,136 @@
+import argparse
+import signal
+import sys
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from flask import Flask, request, jsonify
+from werkzeug.serving import WSGIRequestHandler
+
+from converter_class import TemperatureConverter, ValidationHandler, ConversionLogger
+from metrics import metrics
+
+
+MAX_BATCH_SIZE = 100_000
+
+
+def convert_batch(converter: TemperatureConverter, values, scales, to_scale: str) -> dict:
+    values = np.asarray(values, dtype=object)
+    if isinstance(scales, str):
+        scales = np.full(len(values), scales.upper(), dtype=object)
+    else:
+        labels, unique_scales = pd.factorize(np.asarray(scales, dtype=object))
+        scales = np.array([str(scale).strip().upper() for scale in unique_scales], dtype=object)[labels]
+
+    valid, codes = ValidationHandler.validate_many(values, scales)
+    source_values = pd.to_numeric(values[valid]).astype(np.float64)
+    source_scales = scales[valid]
+
+    converted = np.empty(len(source_values))
+    for scale in pd.unique(source_scales):
+        mask = source_scales == scale
+        converted[mask] = converter.convert_many(source_values[mask], scale, to_scale)
+
+    results = np.full(len(values), None, dtype=object)
+    results[valid] = converted
+    errors = [{'index': int(index), 'error': ValidationHandler.error_message(code, scale)}
+              for index, code, scale in zip(np.flatnonzero(~valid), codes[~valid], scales[~valid])]
+
+    return {
+        'to': to_scale,
+        'results': results.tolist(),
+        'errors': errors,
+        'converted': len(source_values),
+        'rejected': len(errors),
+        'log': (source_values, source_scales, converted),
+    }
+
+
+def batch_shape_error(values: list, scales) -> Optional[str]:
+    if not all(value is None or isinstance(value, (int, float, str)) and not isinstance(value, bool)
+               for value in values):
+        return "'values' must be a flat list of numbers or numeric strings"
+    if isinstance(scales, str):
+        return None
+    if not isinstance(scales, list) or not all(isinstance(scale, str) for scale in scales):
+        return "'from' must be a scale name or a list of scale names"
+    if len(scales) != len(values):
+        return f"'from' has {len(scales)} scales for {len(values)} values"
+    return None
+
+
+def create_app(converter: TemperatureConverter = None, logger: ConversionLogger = None) -> Flask:
+    converter = converter or TemperatureConverter(confirm=False)
+    app = Flask(__name__)
+
+    @app.route('/api/health')
+    def health():
+        return jsonify({'status': 'ok', 'scales': list(ValidationHandler.to_celsius)})
+
+    @app.route('/api/metrics')
+    def metrics_snapshot():
+        snapshot = metrics.snapshot()
+        if logger is not None:
+            snapshot['log_queue'] = logger.queue_stats()
+        return jsonify(snapshot)
+
+    @app.route('/api/convert', methods=['POST'])
+    def convert():
+        try:
+            data = request.get_json(silent=True)
+            if not isinstance(data, dict) or not isinstance(data.get('values'), list):
+                return jsonify({'error': "Expected a JSON object with a 'values' list"}), 400
+
+            values = data['values']
+            scales = data.get('from', 'C')
+            to_scale = str(data.get('to', 'F')).upper()
+
+            if len(values) > MAX_BATCH_SIZE:
+                return jsonify({'error': f"Batch too large: {len(values)} values (max {MAX_BATCH_SIZE})"}), 413
+            if to_scale not in ValidationHandler.to_celsius:
+                return jsonify({'error': ValidationHandler.error_message(
+                    ValidationHandler.INVALID_SCALE, to_scale)}), 400
+            shape_error = batch_shape_error(values, scales)
+            if shape_error is not None:
+                return jsonify({'error': shape_error}), 400
+
+            with metrics.timer('server.convert_batch'):
+                result = convert_batch(converter, values, scales, to_scale)
+            source_values, source_scales, converted = result.pop('log')
+            if logger is not None:
+                logger.log_many(source_values, source_scales, converted, to_scale)
+
+            return jsonify(result)
+
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    return app
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Temperature conversion HTTP service")
+    parser.add_argument('--host', default='127.0.0.1', help="interface to bind (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=5050, help="port to listen on (default: 5050)")
+    parser.add_argument('--log-file', default='conversion_log.csv', help="conversion log (default: conversion_log.csv)")
+    parser.add_argument('--no-log', action='store_true', help="do not log conversions")
+    parser.add_argument('--metrics', action='store_true', help="record counters and latencies for /api/metrics")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.metrics:
+        metrics.enable()
+    logger = None if args.no_log else ConversionLogger(args.log_file, background=True)
+    app = create_app(TemperatureConverter(confirm=False), logger)
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    WSGIRequestHandler.protocol_version = "HTTP/1.1"
+    print(f"Conversion service listening on http://{args.host}:{args.port}/api/convert")
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
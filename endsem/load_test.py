@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import http.client
+import json
+import time
+
+import numpy as np
+
+
+def run_worker(host: str, port: int, path: str, body: bytes, requests: int) -> list:
+    connection = http.client.HTTPConnection(host, port)
+    headers = {'Content-Type': 'application/json', 'Connection': 'keep-alive'}
+    latencies = []
+
+    for _ in range(requests):
+        start = time.perf_counter()
+        connection.request('POST', path, body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 200:
+            raise RuntimeError(f"Request failed with HTTP {response.status}")
+
+    connection.close()
+    return latencies
+
+
+def make_batch(batch_size: int, seed: int = 0) -> bytes:
+    rng = np.random.default_rng(seed)
+    values = np.round(rng.uniform(-50, 150, batch_size), 2).tolist()
+    scales = rng.choice(['C', 'F', 'K'], batch_size).tolist()
+    return json.dumps({'values': values, 'from': scales, 'to': 'C'}).encode()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the conversion HTTP service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5050)
+    parser.add_argument('--path', default='/api/convert')
+    parser.add_argument('--requests', type=int, default=2000, help="total requests (default: 2000)")
+    parser.add_argument('--concurrency', type=int, default=8, help="persistent connections (default: 8)")
+    parser.add_argument('--batch-size', type=int, default=100, help="readings per request (default: 100)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    body = make_batch(args.batch_size)
+    per_worker = [args.requests // args.concurrency + (i < args.requests % args.concurrency)
+                  for i in range(args.concurrency)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = pool.map(lambda count: run_worker(args.host, args.port, args.path, body, count), per_worker)
+        latencies = np.array([latency for worker in results for latency in worker])
+    elapsed = time.perf_counter() - start
+
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"{len(latencies)} requests, {args.concurrency} connections, {args.batch_size} readings each")
+    print(f"  elapsed      {elapsed:>10.2f} s")
+    print(f"  requests/s   {len(latencies) / elapsed:>10,.0f}")
+    print(f"  readings/s   {len(latencies) * args.batch_size / elapsed:>10,.0f}")
+    print(f"  p50 latency  {p50:>10.2f} ms")
+    print(f"  p99 latency  {p99:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers in other processes are not locked out
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnarLog:
+
+    COLUMN_DTYPES = {
+        'timestamp': np.dtype('<i8'),
+        'source_value': np.dtype('<f8'),
+        'source_scale': np.dtype('i1'),
+        'target_value': np.dtype('<f8'),
+        'target_scale': np.dtype('i1'),
+    }
+    SCALES_FILE = "scales.json"
+    TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+    CSV_COLUMNS = ['Timestamp', 'Source_Value', 'Source_Scale',
+                   'Target_Value', 'Target_Scale', 'Conversion_Type']
+
+    def __init__(self, directory: str = "conversion_log.columns"):
+        self.directory = directory
+        self._files = {}
+        os.makedirs(self.directory, exist_ok=True)
+        self.scales = self._load_scales()
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.bin")
+
+    def _load_scales(self) -> list:
+        path = os.path.join(self.directory, self.SCALES_FILE)
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            return json.load(f)
+
+    def _save_scales(self):
+        path = os.path.join(self.directory, self.SCALES_FILE)
+        with open(path + ".tmp", 'w') as f:
+            json.dump(self.scales, f)
+        os.replace(path + ".tmp", path)
+
+    def _encode_scales(self, scales) -> np.ndarray:
+        labels, unique_scales = pd.factorize(np.asarray(scales).ravel())
+        lookup = []
+        added = False
+        for scale in unique_scales:
+            scale = str(scale)
+            if scale not in self.scales:
+                self.scales.append(scale)
+                added = True
+            lookup.append(self.scales.index(scale))
+        if added:
+            self._save_scales()
+        return np.asarray(lookup, dtype=self.COLUMN_DTYPES['source_scale'])[labels]
+
+    def append(self, timestamps, source_values, source_scales, target_values, target_scales):
+        columns = {
+            'timestamp': np.asarray(timestamps, dtype='datetime64[s]').view('<i8'),
+            'source_value': np.asarray(source_values, dtype='<f8'),
+            'source_scale': self._encode_scales(source_scales),
+            'target_value': np.asarray(target_values, dtype='<f8'),
+            'target_scale': self._encode_scales(target_scales),
+        }
+        for name, values in columns.items():
+            f = self._files.get(name)
+            if f is None:
+                f = self._files[name] = open(self._column_path(name), 'ab')
+            f.write(values.astype(self.COLUMN_DTYPES[name], copy=False).tobytes())
+
+    def append_rows(self, rows: list):
+        if not rows:
+            return
+        timestamps, source_values, source_scales, target_values, target_scales = zip(*rows)
+        self.append(timestamps, source_values, source_scales, target_values, target_scales)
+
+    def flush(self, fsync: bool = False):
+        for f in self._files.values():
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+
+    def close(self):
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    def __len__(self) -> int:
+        self.flush()
+        lengths = []
+        for name, dtype in self.COLUMN_DTYPES.items():
+            path = self._column_path(name)
+            lengths.append(os.path.getsize(path) // dtype.itemsize if os.path.exists(path) else 0)
+        return min(lengths)
+
+    def read_columns(self) -> dict:
+        rows = len(self)
+        columns = {}
+        for name, dtype in self.COLUMN_DTYPES.items():
+            if rows == 0:
+                columns[name] = np.empty(0, dtype=dtype)
+            else:
+                columns[name] = np.memmap(self._column_path(name), dtype=dtype, mode='r', shape=(rows,))
+        columns['timestamp'] = columns['timestamp'].view('datetime64[s]')
+        return columns
+
+    def to_dataframe(self) -> pd.DataFrame:
+        columns = self.read_columns()
+        scales = list(self.scales)
+        pair_codes = (columns['source_scale'].astype(np.int16) * max(len(scales), 1)
+                      + columns['target_scale'])
+        conversion_types = [f"{source} to {target}" for source in scales for target in scales]
+
+        return pd.DataFrame({
+            'Timestamp': columns['timestamp'],
+            'Source_Value': columns['source_value'],
+            'Source_Scale': pd.Categorical.from_codes(columns['source_scale'], categories=scales),
+            'Target_Value': columns['target_value'],
+            'Target_Scale': pd.Categorical.from_codes(columns['target_scale'], categories=scales),
+            'Conversion_Type': pd.Categorical.from_codes(
+                pair_codes, categories=conversion_types).remove_unused_categories(),
+        }, copy=False)
+
+    def import_csv(self, csv_file: str, chunksize: int = 1_000_000) -> int:
+        rows = 0
+        for chunk in pd.read_csv(csv_file, chunksize=chunksize):
+            timestamps = pd.to_datetime(chunk['Timestamp'], format=self.TIMESTAMP_FORMAT)
+            self.append(timestamps.to_numpy(), chunk['Source_Value'].to_numpy(),
+                        chunk['Source_Scale'].to_numpy(), chunk['Target_Value'].to_numpy(),
+                        chunk['Target_Scale'].to_numpy())
+            rows += len(chunk)
+        self.flush()
+        return rows
+
+    def export_csv(self, csv_file: str) -> int:
+        df = self.to_dataframe()
+        df['Timestamp'] = df['Timestamp'].dt.strftime(self.TIMESTAMP_FORMAT)
+        df.to_csv(csv_file, index=False, columns=self.CSV_COLUMNS)
+        return len(df)
+
+
+class LogArchive:
+
+    MANIFEST_FILE = "manifest.json"
+    TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+    def __init__(self, log_file: str = "conversion_log.csv"):
+        self.log_file = log_file
+        self.directory = os.path.splitext(log_file)[0] + ".archive"
+        self.lock_file = os.path.splitext(log_file)[0] + ".lock"
+        self.partitions = self._load_manifest()
+        self._thread_lock = threading.RLock()
+        self._lock_depth = 0
+        self._lock_handle = None
+
+    @contextmanager
+    def locked(self):
+        """Hold the lock that every process appending to or rotating this log shares (reentrant)"""
+        with self._thread_lock:
+            if self._lock_depth == 0:
+                if self._lock_handle is None:
+                    self._lock_handle = open(self.lock_file, 'a')
+                if fcntl is not None:
+                    fcntl.flock(self._lock_handle, fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0 and fcntl is not None:
+                    fcntl.flock(self._lock_handle, fcntl.LOCK_UN)
+
+    def close(self):
+        with self._thread_lock:
+            if self._lock_handle is not None:
+                self._lock_handle.close()
+                self._lock_handle = None
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.directory, self.MANIFEST_FILE)
+
+    def _load_manifest(self) -> list:
+        if not os.path.exists(self._manifest_path()):
+            return []
+        with open(self._manifest_path()) as f:
+            return json.load(f)['partitions']
+
+    def _save_manifest(self):
+        path = self._manifest_path()
+        with open(path + ".tmp", 'w') as f:
+            json.dump({'partitions': self.partitions}, f, indent=2)
+        os.replace(path + ".tmp", path)
+
+    def refresh(self):
+        # Other processes sharing the log may have archived partitions since we last looked
+        self.partitions = self._load_manifest()
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self.partitions)
+
+    @staticmethod
+    def read_time_range(path: str):
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            f.readline()
+            first = f.readline()
+            if not first.strip():
+                return None
+            f.seek(0, os.SEEK_END)
+            f.seek(max(f.tell() - 4096, 0))
+            last = f.read().rstrip(b"\r\n").rsplit(b"\n", 1)[-1]
+        return first.split(b",", 1)[0].decode(), last.split(b",", 1)[0].decode()
+
+    def archive_active_log(self) -> Optional[dict]:
+        with self.locked():
+            self.refresh()
+            return self._archive_active_log()
+
+    def _archive_active_log(self) -> Optional[dict]:
+        time_range = self.read_time_range(self.log_file)
+        if time_range is None:
+            return None
+
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.log_file, 'rb') as f:
+            rows = sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b"")) - 1
+
+        stem = os.path.splitext(os.path.basename(self.log_file))[0]
+        name = f"{stem}-{time_range[0].replace('-', '').replace(':', '').replace(' ', '-')}"
+        filename = f"{name}.csv"
+        sequence = 1
+        while os.path.exists(os.path.join(self.directory, filename)):
+            sequence += 1
+            filename = f"{name}-{sequence}.csv"
+
+        os.replace(self.log_file, os.path.join(self.directory, filename))
+        partition = {'file': filename, 'start': time_range[0], 'end': time_range[1], 'rows': rows}
+        self.partitions.append(partition)
+        self._save_manifest()
+        return partition
+
+    @classmethod
+    def _format_bound(cls, bound) -> Optional[str]:
+        if bound is None:
+            return None
+        return pd.Timestamp(bound).strftime(cls.TIMESTAMP_FORMAT)
+
+    def select(self, since=None, until=None) -> list:
+        since, until = self._format_bound(since), self._format_bound(until)
+        self.refresh()
+        paths = []
+        for partition in self.partitions:
+            if since is not None and partition['end'] < since:
+                continue
+            if until is not None and partition['start'] > until:
+                continue
+            paths.append(os.path.join(self.directory, partition['file']))
+
+        active_range = self.read_time_range(self.log_file)
+        if (active_range is not None
+                and (since is None or active_range[1] >= since)
+                and (until is None or active_range[0] <= until)):
+            paths.append(self.log_file)
+        return paths
+
+
+def main():
+    if len(sys.argv) != 4 or sys.argv[1] not in ('import', 'export'):
+        print("Usage: python3 log_storage.py import <csv_file> <columnar_dir>")
+        print("       python3 log_storage.py export <columnar_dir> <csv_file>")
+        return
+
+    if sys.argv[1] == 'import':
+        store = ColumnarLog(sys.argv[3])
+        rows = store.import_csv(sys.argv[2])
+        store.close()
+        print(f"Imported {rows} rows from {sys.argv[2]} into {sys.argv[3]}")
+    else:
+        rows = ColumnarLog(sys.argv[2]).export_csv(sys.argv[3])
+        print(f"Exported {rows} rows from {sys.argv[2]} to {sys.argv[3]}")
+
+
+if __name__ == "__main__":
+    main()
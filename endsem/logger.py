@@ -1,27 +1,182 @@
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import os
+import io
+import hashlib
+import inspect
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from datetime import datetime
 
+from converter_class import RunningMoments, TemperatureConverter
+from log_storage import ColumnarLog, LogArchive
+from metrics import metrics
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    
+    selected = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_x = x[end:edges[bucket + 2]].mean()
+            next_y = y[end:edges[bucket + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        
+        areas = np.abs((x[selected] - next_x) * (y[start:end] - y[selected])
+                       - (x[selected] - x[start:end]) * (next_y - y[selected]))
+        selected = start + int(np.argmax(areas))
+        indices[bucket + 1] = selected
+    
+    return indices
+
+
+def _render_chart(df: pd.DataFrame, method_name: str, output_file: str) -> tuple:
+    plt.switch_backend('Agg')
+    analyzer = DataAnalyzer()
+    analyzer.df = df
+    
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        getattr(analyzer, method_name)(output_file)
+    return output_file, time.perf_counter() - start
+
+
+class ChartCache:
+    
+    # Part of every key: bump it whenever a chart's drawing code changes so stale images are never served
+    VERSION = 2
+    
+    def __init__(self, directory: str = ".chart_cache", max_bytes: int = 100_000_000):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.png")
+    
+    @staticmethod
+    def make_key(fingerprint: str, chart: str, params: dict) -> str:
+        description = f"{ChartCache.VERSION}|{fingerprint}|{chart}|{sorted(params.items())}"
+        return hashlib.sha256(description.encode()).hexdigest()
+    
+    def fetch(self, key: str, output_file: str) -> bool:
+        path = self._path(key)
+        if not os.path.exists(path):
+            self.misses += 1
+            metrics.increment('chart.cache.misses')
+            return False
+        
+        shutil.copyfile(path, output_file)
+        os.utime(path)
+        self.hits += 1
+        metrics.increment('chart.cache.hits')
+        return True
+    
+    def store(self, key: str, output_file: str):
+        shutil.copyfile(output_file, self._path(key))
+        self.evict()
+    
+    def _entries(self) -> list:
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".png"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        return sorted(entries)
+    
+    def evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+    
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries)
+        }
+
 
 class DataAnalyzer:
     
-    def __init__(self, log_file: str = "conversion_log.csv"):
+    STREAM_DTYPES = {
+        'Source_Value': 'float32',
+        'Source_Scale': 'category',
+        'Conversion_Type': 'category',
+    }
+    TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+    RESAMPLE_UNITS = {'D': 'D', 'h': 'h', 'min': 'm'}
+    TIMELINE_MARKER_LIMIT = 100
+    
+    CHARTS = {
+        'frequency': ('create_frequency_chart', "conversion_frequency.png"),
+        'distribution': ('create_temperature_distribution_chart', "temperature_distribution.png"),
+        'timeline': ('create_timeline_chart', "conversion_timeline.png"),
+    }
+    
+    def __init__(self, log_file: str = "conversion_log.csv", chart_cache: ChartCache = None):
         self.log_file = log_file
+        self.chart_cache = chart_cache
         self.df = None
+        self._fingerprint = None
+        self._scale_summary = {}
     
-    def load_data(self) -> bool:
+    @metrics.timed('analysis.load')
+    def load_data(self, since=None, until=None) -> bool:
+        self._fingerprint = None
+        self._scale_summary = {}
         try:
-            if os.path.exists(self.log_file):
-                self.df = pd.read_csv(self.log_file)
-                return True
+            if os.path.isdir(self.log_file):
+                self.df = ColumnarLog(self.log_file).to_dataframe()
+            elif os.path.exists(self.log_file):
+                partition_files = LogArchive(self.log_file).select(since, until)
+                frames = [pd.read_csv(path) for path in partition_files]
+                self.df = pd.concat(frames, ignore_index=True) if frames else pd.read_csv(self.log_file)
+                self.df['Timestamp'] = pd.to_datetime(self.df['Timestamp'], format=self.TIMESTAMP_FORMAT)
             else:
                 print(f"Log file not found: {self.log_file}")
                 return False
+            
+            if since is not None or until is not None:
+                self.df = self._filter_time_range(self.df, since, until)
+            return True
         except Exception as e:
             print(f"Error loading data: {e}")
             return False
     
+    @staticmethod
+    def _filter_time_range(df: pd.DataFrame, since=None, until=None) -> pd.DataFrame:
+        timestamps = df['Timestamp']
+        mask = pd.Series(True, index=df.index)
+        if since is not None:
+            mask &= timestamps >= pd.Timestamp(since)
+        if until is not None:
+            mask &= timestamps <= pd.Timestamp(until)
+        return df[mask].reset_index(drop=True)
+    
     def get_dataframe(self) -> pd.DataFrame:
         if self.df is None:
             self.load_data()
@@ -33,32 +188,92 @@ class DataAnalyzer:
         
         return self.df['Conversion_Type'].value_counts()
     
-    def analyze_temperature_distribution(self, scale: str = 'C') -> dict:
+    def resample_counts(self, freq: str = 'D') -> pd.Series:
+        if self.df is None or self.df.empty:
+            return pd.Series(dtype='int64')
+        
+        timestamps = self.df['Timestamp']
+        unit = self.RESAMPLE_UNITS.get(freq)
+        if unit is not None:
+            buckets = pd.Series(timestamps.to_numpy().astype(f'datetime64[{unit}]'))
+        else:
+            buckets = timestamps.dt.floor(freq)
+        
+        counts = buckets.value_counts(sort=False).sort_index()
+        counts.index.name = 'Timestamp'
+        return counts.rename('count')
+    
+    def get_scale_summary(self, bins: int = 10) -> dict:
         if self.df is None or self.df.empty:
             return {}
         
-        scale_data = self.df[self.df['Source_Scale'] == scale]['Source_Value']
+        if bins not in self._scale_summary:
+            grouped = self.df.groupby('Source_Scale', observed=True)['Source_Value']
+            stats = grouped.agg(['mean', 'median', 'std', 'min', 'max', 'count'])
+            
+            summary = {}
+            for scale, values in grouped:
+                counts, edges = np.histogram(values.to_numpy(), bins=bins)
+                summary[scale] = {
+                    **stats.loc[scale].to_dict(),
+                    'count': int(stats.loc[scale, 'count']),
+                    'hist_counts': counts,
+                    'bin_edges': edges
+                }
+            self._scale_summary[bins] = summary
+        
+        return self._scale_summary[bins]
+    
+    def analyze_temperature_distribution(self, scale: str = 'C') -> dict:
+        scale_summary = self.get_scale_summary().get(scale)
         
-        if scale_data.empty:
+        if not scale_summary:
             return {}
         
-        return {
-            'mean': scale_data.mean(),
-            'median': scale_data.median(),
-            'std': scale_data.std(),
-            'min': scale_data.min(),
-            'max': scale_data.max(),
-            'count': len(scale_data)
-        }
+        return {key: scale_summary[key] for key in ('mean', 'median', 'std', 'min', 'max', 'count')}
     
-    def create_frequency_chart(self, output_file: str = "conversion_frequency.png"):
+    def fingerprint(self) -> str:
+        if self._fingerprint is None:
+            row_hashes = pd.util.hash_pandas_object(self.df, index=False).to_numpy()
+            digest = hashlib.sha256(row_hashes.tobytes())
+            digest.update(repr(list(self.df.columns)).encode())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+    
+    def _chart_params(self, method_name: str) -> dict:
+        parameters = inspect.signature(getattr(self, method_name)).parameters
+        return {name: parameter.default for name, parameter in parameters.items()
+                if name != 'output_file'}
+    
+    def _chart_key(self, chart: str, output_file: str, params: dict) -> str:
+        # savefig picks the format from the extension, so a cached PNG must never be copied into a .svg or .pdf
+        output_format = os.path.splitext(output_file)[1].lstrip('.').lower() or 'png'
+        return ChartCache.make_key(self.fingerprint(), chart, {**params, 'format': output_format})
+    
+    def _fetch_cached_chart(self, chart: str, output_file: str, params: dict) -> bool:
+        if self.chart_cache is None:
+            return False
+        return self.chart_cache.fetch(self._chart_key(chart, output_file, params), output_file)
+    
+    def _store_cached_chart(self, chart: str, output_file: str, params: dict):
+        if self.chart_cache is not None:
+            self.chart_cache.store(self._chart_key(chart, output_file, params), output_file)
+    
+    @metrics.timed('chart.frequency')
+    def create_frequency_chart(self, output_file: str = "conversion_frequency.png",
+                               dpi: int = 300, figsize: tuple = (10, 6)):
         if self.df is None or self.df.empty:
             print("No data available for chart creation")
             return
         
+        params = {'dpi': dpi, 'figsize': figsize}
+        if self._fetch_cached_chart('frequency', output_file, params):
+            print(f"Frequency chart saved to: {output_file} (cached)")
+            return
+        
         frequency = self.analyze_conversion_frequency()
         
-        plt.figure(figsize=(10, 6))
+        plt.figure(figsize=figsize)
         frequency.plot(kind='bar', color='skyblue', edgecolor='navy')
         plt.title('Temperature Conversion Frequency', fontsize=16, fontweight='bold')
         plt.xlabel('Conversion Type', fontsize=12)
@@ -66,57 +281,196 @@ class DataAnalyzer:
         plt.xticks(rotation=45, ha='right')
         plt.grid(axis='y', alpha=0.3)
         plt.tight_layout()
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
         print(f"Frequency chart saved to: {output_file}")
         plt.close()
+        self._store_cached_chart('frequency', output_file, params)
     
-    def create_temperature_distribution_chart(self, output_file: str = "temperature_distribution.png"):
+    @metrics.timed('chart.distribution')
+    def create_temperature_distribution_chart(self, output_file: str = "temperature_distribution.png",
+                                              dpi: int = 300, figsize: tuple = (15, 5), bins: int = 10):
         if self.df is None or self.df.empty:
             print("No data available for chart creation")
             return
         
-        fig, axes = plt.subplots(1, 3, figsize=(15, 5))
-        scales = ['C', 'F', 'K']
-        colors = ['coral', 'lightgreen', 'lightblue']
+        params = {'dpi': dpi, 'figsize': figsize, 'bins': bins}
+        if self._fetch_cached_chart('distribution', output_file, params):
+            print(f"Distribution chart saved to: {output_file} (cached)")
+            return
         
-        for ax, scale, color in zip(axes, scales, colors):
-            scale_data = self.df[self.df['Source_Scale'] == scale]['Source_Value']
-            
-            if not scale_data.empty:
-                ax.hist(scale_data, bins=10, color=color, edgecolor='black', alpha=0.7)
-                ax.set_title(f'Temperature Distribution ({scale})', fontweight='bold')
-                ax.set_xlabel(f'Temperature (°{scale})')
-                ax.set_ylabel('Frequency')
-                ax.grid(axis='y', alpha=0.3)
-            else:
-                ax.text(0.5, 0.5, f'No data for {scale}', 
-                       ha='center', va='center', transform=ax.transAxes)
+        scale_summary = self.get_scale_summary(bins)
+        # One panel per scale that has data, in the converter's scale order
+        scales = [scale for scale in TemperatureConverter.SCALES if scale in scale_summary]
+        if not scales:
+            print("No data available for chart creation")
+            return
+        
+        fig, axes = plt.subplots(1, len(scales), figsize=figsize, squeeze=False)
+        colors = ['coral', 'lightgreen', 'lightblue', 'khaki', 'plum', 'lightgray']
+        
+        for ax, scale, color in zip(axes[0], scales, colors):
+            histogram = scale_summary[scale]
+            edges = histogram['bin_edges']
+            ax.hist(edges[:-1], bins=edges, weights=histogram['hist_counts'],
+                    color=color, edgecolor='black', alpha=0.7)
+            ax.set_title(f'Temperature Distribution ({scale})', fontweight='bold')
+            ax.set_xlabel(f'Temperature (°{scale})')
+            ax.set_ylabel('Frequency')
+            ax.grid(axis='y', alpha=0.3)
         
         plt.tight_layout()
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
         print(f"Distribution chart saved to: {output_file}")
         plt.close()
+        self._store_cached_chart('distribution', output_file, params)
     
-    def create_timeline_chart(self, output_file: str = "conversion_timeline.png"):
+    @metrics.timed('chart.timeline')
+    def create_timeline_chart(self, output_file: str = "conversion_timeline.png",
+                              dpi: int = 300, figsize: tuple = (12, 6), freq: str = 'D',
+                              max_points: int = 1000):
         if self.df is None or self.df.empty:
             print("No data available for chart creation")
             return
         
-        self.df['Timestamp'] = pd.to_datetime(self.df['Timestamp'])
+        params = {'dpi': dpi, 'figsize': figsize, 'freq': freq, 'max_points': max_points}
+        if self._fetch_cached_chart('timeline', output_file, params):
+            print(f"Timeline chart saved to: {output_file} (cached)")
+            return
         
-        daily_counts = self.df.groupby(self.df['Timestamp'].dt.date).size()
+        counts = self.resample_counts(freq)
+        if len(counts) > max_points:
+            counts = counts.iloc[lttb_indices(counts.index.asi8, counts.to_numpy(), max_points)]
+        marker = 'o' if len(counts) <= self.TIMELINE_MARKER_LIMIT else None
         
-        plt.figure(figsize=(12, 6))
-        daily_counts.plot(kind='line', marker='o', color='purple', linewidth=2, markersize=8)
+        plt.figure(figsize=figsize)
+        counts.plot(kind='line', marker=marker, color='purple', linewidth=2, markersize=8)
         plt.title('Conversion Activity Timeline', fontsize=16, fontweight='bold')
         plt.xlabel('Date', fontsize=12)
         plt.ylabel('Number of Conversions', fontsize=12)
         plt.grid(True, alpha=0.3)
         plt.xticks(rotation=45, ha='right')
         plt.tight_layout()
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
         print(f"Timeline chart saved to: {output_file}")
         plt.close()
+        self._store_cached_chart('timeline', output_file, params)
+    
+    def render_all(self, charts: list = None, output_dir: str = ".", max_workers: int = None) -> dict:
+        if self.df is None or self.df.empty:
+            print("No data available for chart creation")
+            return {}
+        
+        charts = charts or list(self.CHARTS)
+        results = {}
+        pending = {}
+        for chart in charts:
+            method_name, filename = self.CHARTS[chart]
+            output_file = os.path.normpath(os.path.join(output_dir, filename))
+            start = time.perf_counter()
+            if self._fetch_cached_chart(chart, output_file, self._chart_params(method_name)):
+                results[chart] = (output_file, time.perf_counter() - start)
+                print(f"{chart.capitalize()} chart saved to: {output_file} (cached)")
+            else:
+                pending[chart] = (method_name, output_file)
+        
+        if pending:
+            with ProcessPoolExecutor(max_workers=max_workers or min(len(pending), os.cpu_count() or 1)) as pool:
+                futures = {chart: pool.submit(_render_chart, self.df, method_name, output_file)
+                           for chart, (method_name, output_file) in pending.items()}
+                for chart, future in futures.items():
+                    results[chart] = future.result()
+                    output_file, seconds = results[chart]
+                    metrics.observe(f"chart.{chart}", seconds)
+                    self._store_cached_chart(chart, output_file, self._chart_params(pending[chart][0]))
+                    print(f"{chart.capitalize()} chart saved to: {output_file} ({seconds:.2f}s)")
+        
+        return {chart: results[chart] for chart in charts}
+    
+    def _iter_chunks(self, chunksize: int, since=None, until=None, timestamps: bool = True):
+        filtered = since is not None or until is not None
+        
+        if os.path.isdir(self.log_file):
+            df = ColumnarLog(self.log_file).to_dataframe()
+            for start in range(0, len(df), chunksize):
+                chunk = df.iloc[start:start + chunksize]
+                yield self._filter_time_range(chunk, since, until) if filtered else chunk
+            return
+        
+        columns = list(self.STREAM_DTYPES)
+        if timestamps or filtered:
+            columns.append('Timestamp')
+        for path in LogArchive(self.log_file).select(since, until):
+            for chunk in pd.read_csv(path, usecols=columns, dtype=self.STREAM_DTYPES, chunksize=chunksize):
+                if 'Timestamp' in chunk:
+                    chunk['Timestamp'] = pd.to_datetime(chunk['Timestamp'], format=self.TIMESTAMP_FORMAT)
+                yield self._filter_time_range(chunk, since, until) if filtered else chunk
+    
+    @metrics.timed('analysis.streaming')
+    def analyze_streaming(self, chunksize: int = 1_000_000, bins: int = 10,
+                          since=None, until=None) -> dict:
+        if not os.path.exists(self.log_file):
+            print(f"Log file not found: {self.log_file}")
+            return {}
+        
+        total_records = 0
+        frequency = pd.Series(dtype='int64')
+        daily_counts = pd.Series(dtype='int64')
+        moments = {}
+        ranges = {}
+        
+        for chunk in self._iter_chunks(chunksize, since, until):
+            total_records += len(chunk)
+            frequency = frequency.add(chunk['Conversion_Type'].value_counts(), fill_value=0)
+            daily_counts = daily_counts.add(chunk['Timestamp'].dt.floor('D').value_counts(), fill_value=0)
+            
+            grouped = chunk['Source_Value'].astype(np.float64).groupby(chunk['Source_Scale'], observed=True)
+            for scale, stats in grouped.agg(['count', 'mean', 'var', 'min', 'max']).iterrows():
+                scale = str(scale)
+                count = int(stats['count'])
+                m2 = stats['var'] * (count - 1) if count > 1 else 0.0
+                moments.setdefault(scale, RunningMoments()).merge(count, stats['mean'], m2)
+                low, high = ranges.get(scale, (stats['min'], stats['max']))
+                ranges[scale] = (min(low, stats['min']), max(high, stats['max']))
+        
+        edges = {scale: np.histogram_bin_edges([], bins=bins, range=value_range)
+                 for scale, value_range in ranges.items()}
+        hist_counts = {scale: np.zeros(bins, dtype=np.int64) for scale in ranges}
+        if ranges:
+            for chunk in self._iter_chunks(chunksize, since, until, timestamps=False):
+                values = chunk['Source_Value'].astype(np.float64)
+                for scale, scale_values in values.groupby(chunk['Source_Scale'], observed=True):
+                    hist_counts[str(scale)] += np.histogram(scale_values.to_numpy(), bins=edges[str(scale)])[0]
+        
+        scale_summary = {}
+        for scale, running in moments.items():
+            scale_summary[scale] = {
+                'mean': float(running.mean),
+                'median': self._histogram_median(hist_counts[scale], edges[scale]),
+                'std': float(running.std) if running.count > 1 else np.nan,
+                'min': float(ranges[scale][0]),
+                'max': float(ranges[scale][1]),
+                'count': running.count,
+                'hist_counts': hist_counts[scale],
+                'bin_edges': edges[scale]
+            }
+        
+        if not daily_counts.empty:
+            daily_counts.index = daily_counts.index.date
+        return {
+            'total_records': total_records,
+            'frequency': frequency.astype('int64').sort_values(ascending=False),
+            'scale_summary': scale_summary,
+            'daily_counts': daily_counts.astype('int64').sort_index()
+        }
+    
+    @staticmethod
+    def _histogram_median(counts: np.ndarray, edges: np.ndarray) -> float:
+        cumulative = np.cumsum(counts)
+        half = cumulative[-1] / 2
+        index = int(np.searchsorted(cumulative, half))
+        below = cumulative[index - 1] if index > 0 else 0
+        fraction = (half - below) / counts[index] if counts[index] else 0.0
+        return float(edges[index] + fraction * (edges[index + 1] - edges[index]))
     
     def display_data_summary(self):
         if self.df is None or self.df.empty:
@@ -133,7 +487,7 @@ class DataAnalyzer:
         print("\n" + "-" * 60)
         print("Temperature Distribution by Scale:")
         print("-" * 60)
-        for scale in ['C', 'F', 'K']:
+        for scale in TemperatureConverter.SCALES:
             dist = self.analyze_temperature_distribution(scale)
             if dist:
                 print(f"\n{scale} Scale:")
@@ -0,0 +1,183 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+import threading
+import time
+
+
+class LatencyHistogram:
+
+    BUCKET_BOUNDS = [1e-6 * 2 ** exponent for exponent in range(27)]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+
+        rank = q / 100 * self.count
+        cumulative = 0
+        for bound, count in zip(self.BUCKET_BOUNDS, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
+
+
+class _TimedMethod:
+
+    def __init__(self, registry: 'Metrics', name: str, method):
+        self.registry = registry
+        self.name = name
+        self.method = method
+
+    def __set_name__(self, owner, attr: str):
+        setattr(owner, attr, self.method)
+        self.registry._register(owner, attr, self.name)
+
+    def __call__(self, *args, **kwargs):
+        return self.method(*args, **kwargs)
+
+
+class Metrics:
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._sites = []
+        self._originals = {}
+        self.reset()
+        if enabled:
+            self.enable()
+
+    def _register(self, owner, attr: str, name: str):
+        self._sites.append((owner, attr, name))
+        if self.enabled:
+            self._install(owner, attr, name)
+
+    def _install(self, owner, attr: str, name: str):
+        original = owner.__dict__[attr]
+        self._originals[(owner, attr)] = original
+        if isinstance(original, staticmethod):
+            setattr(owner, attr, staticmethod(self._wrap(original.__func__, name)))
+        else:
+            setattr(owner, attr, self._wrap(original, name))
+
+    def _wrap(self, func, name: str):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.observe(name, time.perf_counter() - start)
+        return wrapper
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        for owner, attr, name in self._sites:
+            self._install(owner, attr, name)
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        for (owner, attr), original in self._originals.items():
+            setattr(owner, attr, original)
+        self._originals = {}
+
+    def reset(self):
+        with self._lock:
+            self.counters = {}
+            self.histograms = {}
+
+    def increment(self, name: str, amount: int = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name: str):
+        def decorator(method):
+            return _TimedMethod(self, name, method)
+        return decorator
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'counters': dict(self.counters),
+                'latencies': {name: histogram.summary() for name, histogram in self.histograms.items()},
+            }
+
+    def report(self) -> str:
+        snapshot = self.snapshot()
+        lines = ["=" * 90, "METRICS", "=" * 90]
+
+        if snapshot['latencies']:
+            lines.append(f"{'operation':<28} {'calls':>9} {'total ms':>10} {'mean us':>10} "
+                         f"{'p50 us':>10} {'p99 us':>10} {'max us':>10}")
+            lines.append("-" * 90)
+            for name, stats in sorted(snapshot['latencies'].items(), key=lambda item: -item[1]['total']):
+                lines.append(f"{name:<28} {stats['count']:>9,} {stats['total'] * 1e3:>10.2f} "
+                             f"{stats['mean'] * 1e6:>10.1f} {stats['p50'] * 1e6:>10.1f} "
+                             f"{stats['p99'] * 1e6:>10.1f} {stats['max'] * 1e6:>10.1f}")
+
+        if snapshot['counters']:
+            lines.append("-" * 90)
+            for name, value in sorted(snapshot['counters'].items()):
+                lines.append(f"{name:<28} {value:>9,}")
+
+        if len(lines) == 3:
+            lines.append("No metrics recorded")
+        lines.append("=" * 90)
+        return "\n".join(lines)
+
+
+metrics = Metrics()
@@ -0,0 +1,63 @@
+import time
+
+import pandas as pd
+
+from converter_class import ConversionLogger
+
+
+def rows_on_disk(log_file):
+    return pd.read_csv(log_file)['Source_Value'].tolist()
+
+
+def wait_for_rows(log_file, expected, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while rows_on_disk(log_file) != expected and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return rows_on_disk(log_file)
+
+
+def test_idle_buffered_logger_flushes_on_its_interval(tmp_path):
+    log_file = str(tmp_path / "log.csv")
+    logger = ConversionLogger(log_file, buffered=True, flush_interval=0.2)
+    for value in (1, 2, 3):
+        logger.log_conversion(value, 'C', value * 1.8 + 32, 'F')
+    assert rows_on_disk(log_file) == []
+
+    # No further row arrives to trigger it: the flusher writes them once the interval passes
+    assert wait_for_rows(log_file, [1, 2, 3]) == [1, 2, 3]
+    logger.close()
+
+
+def test_close_stops_the_flusher(tmp_path):
+    logger = ConversionLogger(str(tmp_path / "log.csv"), buffered=True, flush_interval=60)
+    flusher = logger._flusher
+    logger.log_conversion(1, 'C', 33.8, 'F')
+    logger.close()
+
+    assert not flusher.is_alive()
+    assert rows_on_disk(str(tmp_path / "log.csv")) == [1]
+
+
+def test_background_writer_coalesces_rows_and_writes_them_when_idle(tmp_path):
+    log_file = str(tmp_path / "log.csv")
+    logger = ConversionLogger(log_file, background=True, buffer_size=50, flush_interval=0.2)
+    for value in range(120):
+        logger.log_conversion(value, 'C', value * 1.8 + 32, 'F')
+
+    # Nothing else is logged or flushed: the staged tail still reaches the disk
+    assert wait_for_rows(log_file, list(range(120))) == list(range(120))
+    stats = logger.queue_stats()
+    assert stats['rows_written'] == 120
+    assert stats['writes'] < 120
+    logger.close()
+
+
+def test_background_flush_hands_over_staged_rows(tmp_path):
+    log_file = str(tmp_path / "log.csv")
+    logger = ConversionLogger(log_file, background=True, flush_interval=60)
+    logger.log_conversion(1, 'C', 33.8, 'F')
+    logger.log_many([2, 3], 'C', [35.6, 37.4], 'F')
+    logger.flush()
+
+    assert rows_on_disk(log_file) == [1, 2, 3]
+    logger.close()
@@ -0,0 +1,41 @@
+import pytest
+
+pytest.importorskip('matplotlib')
+import matplotlib
+
+matplotlib.use('Agg')
+
+from logger import ChartCache, DataAnalyzer
+
+LOG = """Timestamp,Source_Value,Source_Scale,Target_Value,Target_Scale,Conversion_Type
+2024-01-01 10:00:00,25,C,77.0,F,C to F
+2024-01-01 11:00:00,300,K,26.85,C,K to C
+"""
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    log_file = tmp_path / "log.csv"
+    log_file.write_text(LOG)
+    analyzer = DataAnalyzer(str(log_file), chart_cache=ChartCache(str(tmp_path / "cache")))
+    assert analyzer.load_data()
+    return analyzer
+
+
+def test_cached_chart_is_not_reused_for_another_format(analyzer, tmp_path):
+    analyzer.create_frequency_chart(str(tmp_path / "freq.png"), dpi=50)
+    analyzer.create_frequency_chart(str(tmp_path / "freq.svg"), dpi=50)
+    analyzer.create_frequency_chart(str(tmp_path / "again.svg"), dpi=50)
+
+    assert (tmp_path / "freq.png").read_bytes().startswith(b'\x89PNG')
+    assert b'<svg' in (tmp_path / "freq.svg").read_bytes()[:1000]
+    assert (tmp_path / "again.svg").read_bytes() == (tmp_path / "freq.svg").read_bytes()
+    assert (analyzer.chart_cache.hits, analyzer.chart_cache.misses) == (1, 2)
+
+
+def test_version_bump_invalidates_cached_charts(analyzer, tmp_path, monkeypatch):
+    analyzer.create_frequency_chart(str(tmp_path / "freq.png"), dpi=50)
+    monkeypatch.setattr(ChartCache, 'VERSION', ChartCache.VERSION + 1)
+    analyzer.create_frequency_chart(str(tmp_path / "freq.png"), dpi=50)
+
+    assert (analyzer.chart_cache.hits, analyzer.chart_cache.misses) == (0, 2)
@@ -0,0 +1,15 @@
+import numpy as np
+import pytest
+
+from converter_class import TemperatureConverter
+
+
+def test_convert_many_accepts_scalars():
+    converter = TemperatureConverter(confirm=False)
+    assert converter.convert_many(np.array(5.0), 'C', 'F').tolist() == [41.0]
+    assert converter.convert_many(100, 'c', 'k').tolist() == [373.15]
+
+
+def test_convert_many_rejects_unknown_scale():
+    with pytest.raises(ValueError, match="Unsupported conversion: C to Q"):
+        TemperatureConverter(confirm=False).convert_many([1.0], 'C', 'Q')
@@ -0,0 +1,60 @@
+from datetime import datetime
+
+import pytest
+
+import converter_class
+from converter_class import ConversionLogger
+
+
+class FakeClock:
+
+    current = datetime(2024, 1, 1, 23, 59, 0)
+
+    @classmethod
+    def now(cls):
+        return cls.current
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    FakeClock.current = datetime(2024, 1, 1, 23, 59, 0)
+    monkeypatch.setattr(converter_class, 'datetime', FakeClock)
+    return FakeClock
+
+
+@pytest.mark.parametrize('mode', [{}, {'buffered': True}, {'background': True}])
+def test_daily_rotation_then_restart_restores_each_row_once(tmp_path, clock, mode):
+    log_file = str(tmp_path / "log.csv")
+    logger = ConversionLogger(log_file, rotate='daily', **mode)
+    for value in (0, 1, 2):
+        logger.log_conversion(value, 'C', value * 1.8 + 32, 'F')
+
+    clock.current = datetime(2024, 1, 2, 0, 0, 1)
+    logger.log_conversion(50, 'C', 122, 'F')
+    logger.log_many([60, 70], 'C', [140, 158], 'F')
+    logger.close()
+
+    assert len(logger.archive) == 1
+
+    restored = ConversionLogger(log_file, rotate='daily')
+    restored.restore_from_log()
+    assert restored.history.columns()['source_values'].tolist() == [0, 1, 2, 50, 60, 70]
+    assert restored.statistics.count == 6
+    assert restored.statistics.conversion_counts == {'C to F': 6}
+    restored.close()
+
+
+def test_size_rotation_then_restart_restores_each_row_once(tmp_path):
+    log_file = str(tmp_path / "log.csv")
+    logger = ConversionLogger(log_file, max_bytes=200)
+    for value in range(10):
+        logger.log_conversion(value, 'C', value * 1.8 + 32, 'F')
+    logger.close()
+
+    assert len(logger.archive) > 1
+
+    restored = ConversionLogger(log_file, max_bytes=200)
+    restored.restore_from_log()
+    assert restored.history.columns()['source_values'].tolist() == list(range(10))
+    assert restored.statistics.count == 10
+    restored.close()
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from converter_class import TemperatureConverter
+
+# The boiling point of water on every scale
+BOILING = {'C': 100, 'F': 212, 'K': 373.15, 'R': 671.67, 'RE': 80, 'DE': 0}
+
+PAIRS = [(source, target) for source in TemperatureConverter.SCALES
+         for target in TemperatureConverter.SCALES if source != target]
+
+
+def test_every_scale_has_a_reference_point():
+    assert sorted(BOILING) == sorted(TemperatureConverter.SCALES)
+
+
+@pytest.mark.parametrize('source, target', PAIRS)
+def test_reference_points_agree(source, target):
+    converter = TemperatureConverter(confirm=False)
+    assert converter.convert(BOILING[source], source, target) == pytest.approx(BOILING[target], abs=0.01)
+
+
+@pytest.mark.parametrize('source, target', PAIRS)
+def test_round_trip(source, target):
+    converter = TemperatureConverter(confirm=False)
+    values = np.array([-40.0, 0.0, 36.6, 100.0, 1234.5])
+    there = converter.convert_many(values, source, target)
+    back = converter.convert_many(there, target, source)
+    # Each leg rounds to 2 decimals
+    np.testing.assert_allclose(back, values, atol=0.02)
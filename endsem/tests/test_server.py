@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip('flask')
+
+from converter_server import create_app
+
+
+@pytest.fixture
+def client():
+    return create_app().test_client()
+
+
+def test_convert_batch_with_per_value_scales(client):
+    response = client.post('/api/convert', json={'values': [100, '212', 'x', -500], 'from': ['C', 'F', 'C', 'K'],
+                                                 'to': 'C'})
+    body = response.get_json()
+
+    assert response.status_code == 200
+    assert body['results'] == [100.0, 100.0, None, None]
+    assert [error['index'] for error in body['errors']] == [2, 3]
+
+
+@pytest.mark.parametrize('payload, message', [
+    ({'values': [1], 'from': 5}, "'from' must be a scale name or a list of scale names"),
+    ({'values': [1], 'from': None}, "'from' must be a scale name or a list of scale names"),
+    ({'values': [1], 'from': [['C']]}, "'from' must be a scale name or a list of scale names"),
+    ({'values': [1, 2], 'from': ['C']}, "'from' has 1 scales for 2 values"),
+    ({'values': [[1, 2]]}, "'values' must be a flat list of numbers or numeric strings"),
+    ({'values': [{'a': 1}]}, "'values' must be a flat list of numbers or numeric strings"),
+    ({'values': [True]}, "'values' must be a flat list of numbers or numeric strings"),
+    ({'values': 5}, "Expected a JSON object with a 'values' list"),
+])
+def test_convert_rejects_malformed_batches_with_400(client, payload, message):
+    response = client.post('/api/convert', json=payload)
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': message}
+
+
+def test_convert_rejects_unknown_target_scale(client):
+    response = client.post('/api/convert', json={'values': [1], 'to': 'Q'})
+
+    assert response.status_code == 400
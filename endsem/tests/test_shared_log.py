@@ -0,0 +1,105 @@
+import multiprocessing
+import os
+
+import pandas as pd
+import pytest
+
+from converter_class import ConversionLogger
+
+
+def log_rows(logger, values):
+    for value in values:
+        logger.log_conversion(value, 'C', value * 1.8 + 32, 'F')
+
+
+def partition_rows_match_manifest(logger):
+    for partition in logger.archive.partitions:
+        df = pd.read_csv(os.path.join(logger.archive.directory, partition['file']))
+        assert len(df) == partition['rows']
+        assert (df['Timestamp'].iloc[0], df['Timestamp'].iloc[-1]) == (partition['start'], partition['end'])
+
+
+def restored_values(log_file):
+    restored = ConversionLogger(log_file)
+    restored.restore_from_log()
+    values = sorted(restored.history.columns()['source_values'].tolist())
+    restored.close()
+    return values
+
+
+def test_rotation_keeps_partitions_archived_by_another_writer(tmp_path):
+    log_file = str(tmp_path / "log.csv")
+    first = ConversionLogger(log_file)
+    second = ConversionLogger(log_file)
+
+    log_rows(first, [1, 2])
+    first.rotate_log()
+    log_rows(second, [3, 4])
+    second.rotate_log()
+    log_rows(first, [5])
+    first.rotate_log()
+
+    assert len(first.archive) == 3
+    assert sorted(os.listdir(first.archive.directory)) == sorted(
+        [partition['file'] for partition in first.archive.partitions] + ['manifest.json'])
+    partition_rows_match_manifest(first)
+    first.close()
+    second.close()
+    assert restored_values(log_file) == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.parametrize('mode', [{'buffered': True}, {'background': True}])
+def test_open_writer_follows_a_rotation_by_another_writer(tmp_path, mode):
+    log_file = str(tmp_path / "log.csv")
+    writer = ConversionLogger(log_file, **mode)
+    rotator = ConversionLogger(log_file)
+
+    log_rows(writer, [1, 2])
+    writer.flush()
+    rotator.rotate_log()
+    log_rows(writer, [3, 4])
+    writer.close()
+    rotator.close()
+
+    assert pd.read_csv(log_file)['Source_Value'].tolist() == [3, 4]
+    partition_rows_match_manifest(rotator)
+    assert restored_values(log_file) == [1, 2, 3, 4]
+
+
+def test_no_snapshot_once_another_writer_appended(tmp_path):
+    log_file = str(tmp_path / "log.csv")
+    first = ConversionLogger(log_file)
+    second = ConversionLogger(log_file)
+
+    log_rows(first, [1])
+    log_rows(second, [2])
+    assert not first.save_snapshot()
+    assert not os.path.exists(first.snapshot_file)
+    first.close()
+    second.close()
+    assert restored_values(log_file) == [1, 2]
+
+
+def write_and_rotate(log_file, start, mode):
+    logger = ConversionLogger(log_file, max_bytes=2000, **mode)
+    log_rows(logger, range(start, start + 300))
+    logger.close()
+
+
+def test_processes_sharing_a_rotating_log_lose_no_rows(tmp_path):
+    log_file = str(tmp_path / "log.csv")
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=write_and_rotate, args=(log_file, start, mode))
+                 for start, mode in ((0, {}), (1000, {'buffered': True, 'buffer_size': 7}),
+                                     (2000, {'background': True}))]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    reader = ConversionLogger(log_file)
+    partition_rows_match_manifest(reader)
+    reader.close()
+    expected = list(range(300)) + list(range(1000, 1300)) + list(range(2000, 2300))
+    assert restored_values(log_file) == expected
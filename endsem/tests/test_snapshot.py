@@ -0,0 +1,107 @@
+import os
+
+import numpy as np
+
+from converter_class import ConversionLogger
+
+
+def log_rows(logger, values):
+    for value in values:
+        logger.log_conversion(value, 'C', round(value * 1.8 + 32, 2), 'F')
+
+
+def test_restore_from_snapshot_and_log_tail(tmp_path):
+    log_file = str(tmp_path / "log.csv")
+    logger = ConversionLogger(log_file)
+    log_rows(logger, [0, 10, 20])
+    assert logger.save_snapshot()
+    log_rows(logger, [30, 40])
+    logger.close()
+
+    restored = ConversionLogger(log_file)
+    restored.restore_from_log()
+    columns = restored.history.columns()
+    assert columns['source_values'].tolist() == [0, 10, 20, 30, 40]
+    assert columns['target_values'].tolist() == [32, 50, 68, 86, 104]
+    assert restored.statistics.count == 5
+    assert restored.statistics.conversion_counts == {'C to F': 5}
+    restored.close()
+
+
+def test_snapshot_matches_full_replay(tmp_path):
+    log_file = str(tmp_path / "log.csv")
+    logger = ConversionLogger(log_file)
+    log_rows(logger, [-5, 15, 25])
+    logger.save_snapshot()
+    log_rows(logger, [35])
+    logger.close()
+
+    from_snapshot = ConversionLogger(log_file)
+    from_snapshot.restore_from_log()
+    os.remove(from_snapshot.snapshot_file)
+    replayed = ConversionLogger(log_file)
+    replayed.restore_from_log()
+
+    for name, column in replayed.history.columns().items():
+        np.testing.assert_array_equal(from_snapshot.history.columns()[name], column)
+    assert from_snapshot.statistics.source.state() == replayed.statistics.source.state()
+    from_snapshot.close()
+    replayed.close()
+
+
+def test_snapshot_taken_before_rotation_is_ignored(tmp_path):
+    log_file = str(tmp_path / "log.csv")
+    logger = ConversionLogger(log_file)
+    log_rows(logger, [1, 2])
+    logger.save_snapshot()
+    logger.rotate_log()
+    log_rows(logger, [3])
+    logger.close()
+
+    restored = ConversionLogger(log_file)
+    restored.restore_from_log()
+    assert restored.history.columns()['source_values'].tolist() == [1, 2, 3]
+    assert restored.statistics.count == 3
+    restored.close()
+
+
+def test_unreadable_snapshot_falls_back_to_log(tmp_path, capsys):
+    log_file = str(tmp_path / "log.csv")
+    logger = ConversionLogger(log_file)
+    log_rows(logger, [7, 8])
+    logger.close()
+    with open(logger.snapshot_file, 'wb') as f:
+        f.write(b'not a snapshot')
+
+    restored = ConversionLogger(log_file)
+    restored.restore_from_log()
+    assert restored.history.columns()['source_values'].tolist() == [7, 8]
+    assert "Ignoring unreadable snapshot" in capsys.readouterr().out
+    restored.close()
+
+
+def test_truncated_snapshot_falls_back_to_log(tmp_path, capsys):
+    log_file = str(tmp_path / "log.csv")
+    logger = ConversionLogger(log_file)
+    log_rows(logger, [1, 2, 3])
+    logger.save_snapshot()
+    logger.close()
+    with open(logger.snapshot_file, 'rb') as f:
+        data = f.read()
+    with open(logger.snapshot_file, 'wb') as f:
+        f.write(data[:len(data) // 2])
+
+    restored = ConversionLogger(log_file)
+    restored.restore_from_log()
+    assert restored.history.columns()['source_values'].tolist() == [1, 2, 3]
+    assert "Ignoring unreadable snapshot" in capsys.readouterr().out
+    restored.close()
+
+
+def test_save_snapshot_leaves_no_temporary_file(tmp_path):
+    logger = ConversionLogger(str(tmp_path / "log.csv"))
+    log_rows(logger, [1])
+    assert logger.save_snapshot()
+    logger.close()
+    assert 'log.snapshot.npz' in os.listdir(tmp_path)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
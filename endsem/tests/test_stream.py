@@ -0,0 +1,27 @@
+import pytest
+
+from converter_main import parse_args, run_stream
+
+
+def stream(tmp_path, text, *options):
+    source = tmp_path / "input.csv"
+    source.write_text(text)
+    run_stream(parse_args(['--stream', '--input', str(source), *options]))
+
+
+def test_stream_converts_and_reports_input_line_numbers(tmp_path, capsys):
+    stream(tmp_path, "10\n\nabc\n20,F\n\n\n-500,K\n30,Q\n", '--chunk-size', '2')
+    out, err = capsys.readouterr()
+
+    assert out.splitlines() == ["10.0,C,50.0,F", "20.0,F,20.0,F"]
+    assert [line.split(':')[0] for line in err.splitlines()[:3]] == ["Line 3", "Line 7", "Line 8"]
+    assert "Converted 2 rows (3 rejected)" in err
+
+
+@pytest.mark.parametrize('option', ['--to', '--from'])
+def test_stream_rejects_unknown_scale_before_reading(tmp_path, capsys, option):
+    with pytest.raises(SystemExit) as exit_info:
+        stream(tmp_path, "10\n", option, 'Q')
+
+    assert exit_info.value.code == f"Unsupported scale for {option}: Q (choose from C, F, K, R, RE, DE)"
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,38 @@
+import numpy as np
+
+from converter_class import TemperatureConverter, ValidationHandler
+
+
+def test_validate_many_codes_per_value():
+    valid, codes = ValidationHandler.validate_many(['25', 'abc', -500, 2e6, 10, -400],
+                                                   ['C', 'C', 'C', 'C', 'Q', 'f'])
+    assert codes.tolist() == [ValidationHandler.VALID, ValidationHandler.INVALID_NUMBER,
+                              ValidationHandler.BELOW_ABSOLUTE_ZERO, ValidationHandler.ABOVE_MAXIMUM,
+                              ValidationHandler.INVALID_SCALE, ValidationHandler.VALID]
+    assert valid.tolist() == [True, False, False, False, False, True]
+
+
+def test_validate_many_with_one_scale():
+    _, codes = ValidationHandler.validate_many(np.array([0.0, -1.0, np.nan]), 'K')
+    assert codes.tolist() == [ValidationHandler.VALID, ValidationHandler.BELOW_ABSOLUTE_ZERO,
+                              ValidationHandler.INVALID_NUMBER]
+
+    _, codes = ValidationHandler.validate_many([1, 2], 'Q')
+    assert codes.tolist() == [ValidationHandler.INVALID_SCALE] * 2
+
+
+def test_validate_many_matches_validate_temperature():
+    values = [-300, -273.15, 0, 1e6, 1e6 + 1, 'x']
+    for scale in TemperatureConverter.SCALES:
+        valid, codes = ValidationHandler.validate_many(values, scale)
+        for value, ok, code in zip(values, valid, codes):
+            expected_ok, expected_error = ValidationHandler.validate_temperature(value, scale)
+            assert ok == expected_ok
+            assert ValidationHandler.error_message(int(code), scale) == expected_error
+
+
+def test_validate_many_accepts_scalars():
+    assert ValidationHandler.validate_many(5.0, 'Q')[1].tolist() == [ValidationHandler.INVALID_SCALE]
+    assert ValidationHandler.validate_many(np.array(5.0), ['C'])[1].tolist() == [ValidationHandler.VALID]
+    assert ValidationHandler.validate_many('abc', 'C')[1].tolist() == [ValidationHandler.INVALID_NUMBER]
+    assert ValidationHandler.validate_many(-500, np.array('K'))[1].tolist() == [ValidationHandler.BELOW_ABSOLUTE_ZERO]
@@ -1,20 +1,27 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 import google.generativeai as genai
 import os
+import json
 from dotenv import load_dotenv
 import subprocess
 import re
 import threading
 import webview
 import speech_recognition as sr
+from chat_session import ChatSessionManager
+from command_runner import CommandRunner
+from stub_model import StubModel
 
 # Load environment variables
 load_dotenv()
 
-# Configure Gemini API
-genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
-model = genai.GenerativeModel('gemini-2.5-flash')
+# Configure Gemini API (USE_STUB_MODEL=1 swaps in an offline stub for local measurements)
+if os.getenv('USE_STUB_MODEL'):
+    model = StubModel(base_latency=float(os.getenv('STUB_BASE_LATENCY', 0.05)))
+else:
+    genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
+    model = genai.GenerativeModel('gemini-2.5-flash')
 
 app = Flask(__name__)
 CORS(app)
@@ -26,7 +33,22 @@ Format your commands in code blocks using ```bash or just provide the raw comman
 Always assume macOS with zsh shell.
 Be concise and precise."""
 
-chat_history = []
+# One live chat per conversation; transcripts let a restart rebuild them
+sessions = ChatSessionManager(
+    model,
+    SYSTEM_PROMPT,
+    store_dir=os.getenv('CHAT_STORE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.chat_sessions')),
+    max_context_chars=int(os.getenv('CHAT_CONTEXT_CHARS', 12000)),
+    keep_turns=int(os.getenv('CHAT_KEEP_TURNS', 6)),
+    summary_chars=int(os.getenv('CHAT_SUMMARY_CHARS', 2000))
+)
+# Read-only commands run side by side on a shared pool; each has its own time budget
+command_runner = CommandRunner(
+    max_workers=int(os.getenv('COMMAND_WORKERS', 4)),
+    command_timeout=int(os.getenv('COMMAND_TIMEOUT', 30)),
+    total_timeout=int(os.getenv('COMMAND_TOTAL_TIMEOUT', 90)),
+    shell=os.getenv('COMMAND_SHELL', '/bin/zsh')
+)
 recognizer = sr.Recognizer()
 
 @app.route('/')
@@ -38,42 +60,18 @@ def chat():
     try:
         data = request.json
         message = data.get('message', '')
+        conversation_id = data.get('conversation_id', 'default')
         
-        if not message:
-            return jsonify({'error': 'No message provided'}), 400
+        error = chat_request_error(message, conversation_id)
+        if error:
+            return jsonify({'error': error}), 400
         
-        # Add to chat history
-        chat_history.append({
-            'role': 'user',
-            'parts': [message]
-        })
-        
-        # Create chat with system prompt
-        chat = model.start_chat(history=[
-            {'role': 'user', 'parts': [SYSTEM_PROMPT]},
-            {'role': 'model', 'parts': ['Understood. I will provide zsh terminal commands for macOS tasks.']}
-        ] + chat_history[:-1])
-        
-        response = chat.send_message(message)
-        response_text = response.text
-        
-        # Add AI response to history
-        chat_history.append({
-            'role': 'model',
-            'parts': [response_text]
-        })
+        # Only the new turn is sent; the session keeps the conversation
+        response_text = sessions.send_message(conversation_id, message)
         
         # Extract and execute commands
-        commands = extract_commands(response_text)
-        command_results = []
-        
-        for cmd in commands:
-            if cmd.strip():
-                output = execute_command(cmd)
-                command_results.append({
-                    'command': cmd,
-                    'output': output
-                })
+        commands = [cmd for cmd in extract_commands(response_text) if cmd.strip()]
+        command_results = command_runner.run_all(commands)
         
         # Speak response in background
         threading.Thread(target=speak_response, args=(response_text,), daemon=True).start()
@@ -86,9 +84,69 @@ def chat():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """Same as /api/chat, but sent as server-sent events while the model is still answering"""
+    data = request.json or {}
+    message = data.get('message', '')
+    conversation_id = data.get('conversation_id', 'default')
+    
+    error = chat_request_error(message, conversation_id)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    def events():
+        try:
+            # Forward each chunk the moment it arrives, so the first words show up right away
+            parts = []
+            for text in sessions.stream_message(conversation_id, message):
+                parts.append(text)
+                yield sse_event('delta', {'text': text})
+            
+            response_text = ''.join(parts)
+            yield sse_event('response', {'response': response_text})
+            
+            # Output streams in while commands run; events carry the command's index
+            commands = [cmd for cmd in extract_commands(response_text) if cmd.strip()]
+            for event in command_runner.stream(commands):
+                yield sse_event(f"command_{event.pop('type')}", event)
+            
+            threading.Thread(target=speak_response, args=(response_text,), daemon=True).start()
+        except Exception as e:
+            yield sse_event('error', {'error': str(e)})
+        yield sse_event('done', {})
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def chat_request_error(message, conversation_id):
+    """Why a chat request can't be served, or None"""
+    if not message:
+        return 'No message provided'
+    if not isinstance(conversation_id, str) or not conversation_id:
+        return "'conversation_id' must be a non-empty string"
+    return None
+
+def sse_event(event, data):
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/api/sessions', methods=['GET'])
+def session_stats():
+    """Live session counts, new-message bytes per turn and latency"""
+    return jsonify(sessions.stats())
+
 @app.route('/api/voice', methods=['POST'])
 def voice():
     """Handle voice input using SpeechRecognition capture + Gemini transcription"""
+    payload, status = transcribe_voice()
+    return jsonify(payload), status
+
+def transcribe_voice():
+    """Record one phrase from the microphone and transcribe it; returns (payload, status code)"""
     try:
         import tempfile
         
@@ -122,9 +180,9 @@ def voice():
                 transcript = response.text.strip()
                 
                 if transcript:
-                    return jsonify({'text': transcript})
+                    return {'text': transcript}, 200
                 else:
-                    return jsonify({'error': 'No speech detected'}), 400
+                    return {'error': 'No speech detected'}, 400
             finally:
                 # Cleanup temp file
                 if os.path.exists(temp_wav_path):
@@ -135,15 +193,15 @@ def voice():
             # Fallback to Google Speech Recognition if Gemini fails
             print("Falling back to Google Speech Recognition...")
             text = recognizer.recognize_google(audio)
-            return jsonify({'text': text})
+            return {'text': text}, 200
 
     except sr.WaitTimeoutError:
-        return jsonify({'error': 'No speech detected'}), 400
+        return {'error': 'No speech detected'}, 400
     except sr.UnknownValueError:
-        return jsonify({'error': 'Could not understand audio'}), 400
+        return {'error': 'Could not understand audio'}, 400
     except Exception as e:
         print(f"Voice error: {e}")
-        return jsonify({'error': str(e)}), 500
+        return {'error': str(e)}, 500
 
 def extract_commands(text):
     """Extract shell commands from AI response"""
@@ -168,36 +226,6 @@ def extract_commands(text):
     
     return commands
 
-def execute_command(command):
-    """Execute shell command and return output"""
-    try:
-        if command.strip().startswith('open'):
-            subprocess.Popen(
-                command,
-                shell=True,
-                executable='/bin/zsh',
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
-            return f"✓ Opened: {command.replace('open ', '')}"
-        
-        result = subprocess.run(
-            command,
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=30,
-            executable='/bin/zsh',
-            cwd=os.path.expanduser('~')
-        )
-        
-        output = result.stdout + result.stderr
-        return output.strip() if output.strip() else "✓ Command executed successfully"
-    except subprocess.TimeoutExpired:
-        return "⚠ Command timed out after 30 seconds"
-    except Exception as e:
-        return f"✗ Error: {str(e)}"
-
 def speak_response(text):
     """Use macOS say command to speak the response"""
     try:
@@ -0,0 +1,140 @@
+import argparse
+import asyncio
+import os
+import threading
+
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
+from quart import Quart, render_template, request, jsonify, make_response
+
+from app import sessions, chat_request_error, extract_commands, speak_response, sse_event, transcribe_voice
+from command_runner import AsyncCommandRunner
+
+# Async serving mode: the same routes as app.py as async views on one event loop.
+# A request waiting on Gemini or a command holds no thread, so one slow chat never blocks another.
+app = Quart(__name__)
+
+# The model client and its chat sessions are created once (in app.py) and reused by every request;
+# at most MODEL_CONCURRENCY calls are in flight and the rest wait here for a free slot
+model_slots = asyncio.Semaphore(int(os.getenv('MODEL_CONCURRENCY', 32)))
+
+command_runner = AsyncCommandRunner(
+    max_workers=int(os.getenv('COMMAND_WORKERS', 4)),
+    command_timeout=int(os.getenv('COMMAND_TIMEOUT', 30)),
+    total_timeout=int(os.getenv('COMMAND_TOTAL_TIMEOUT', 90)),
+    shell=os.getenv('COMMAND_SHELL', '/bin/zsh')
+)
+
+@app.route('/')
+async def index():
+    return await render_template('index.html')
+
+@app.route('/api/chat', methods=['POST'])
+async def chat():
+    try:
+        data = await request.get_json()
+        message = data.get('message', '')
+        conversation_id = data.get('conversation_id', 'default')
+        
+        error = chat_request_error(message, conversation_id)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        async with model_slots:
+            response_text = await sessions.send_message_async(conversation_id, message)
+        
+        commands = [cmd for cmd in extract_commands(response_text) if cmd.strip()]
+        command_results = await command_runner.run_all(commands)
+        
+        threading.Thread(target=speak_response, args=(response_text,), daemon=True).start()
+        
+        return jsonify({
+            'response': response_text,
+            'commands': command_results
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+async def read_model(conversation_id, message, chunks):
+    """Put the model's answer on the chunks queue, then None.
+    
+    The model slot is held only while the model streams, never while a slow client reads.
+    """
+    try:
+        async with model_slots:
+            async for text in sessions.stream_message_async(conversation_id, message):
+                chunks.put_nowait(text)
+    finally:
+        chunks.put_nowait(None)
+
+@app.route('/api/chat/stream', methods=['POST'])
+async def chat_stream():
+    """Same server-sent events as app.py's /api/chat/stream"""
+    data = await request.get_json() or {}
+    message = data.get('message', '')
+    conversation_id = data.get('conversation_id', 'default')
+    
+    error = chat_request_error(message, conversation_id)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    async def events():
+        chunks = asyncio.Queue()
+        reader = asyncio.create_task(read_model(conversation_id, message, chunks))
+        try:
+            parts = []
+            while True:
+                text = await chunks.get()
+                if text is None:
+                    break
+                parts.append(text)
+                yield sse_event('delta', {'text': text})
+            # Raises whatever stopped the model stream
+            await reader
+            
+            response_text = ''.join(parts)
+            yield sse_event('response', {'response': response_text})
+            
+            commands = [cmd for cmd in extract_commands(response_text) if cmd.strip()]
+            async for event in command_runner.stream(commands):
+                yield sse_event(f"command_{event.pop('type')}", event)
+            
+            threading.Thread(target=speak_response, args=(response_text,), daemon=True).start()
+        except Exception as e:
+            yield sse_event('error', {'error': str(e)})
+        finally:
+            # A client that went away mid-answer stops the model stream too
+            reader.cancel()
+        yield sse_event('done', {})
+    
+    response = await make_response(events(), {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    response.mimetype = 'text/event-stream'
+    # Commands may run for up to COMMAND_TOTAL_TIMEOUT; the runner enforces that budget itself
+    response.timeout = None
+    return response
+
+@app.route('/api/sessions', methods=['GET'])
+async def session_stats():
+    """Live session counts and per-turn payload size and latency"""
+    return jsonify(sessions.stats())
+
+@app.route('/api/voice', methods=['POST'])
+async def voice():
+    """Microphone capture and transcription block, so they run in a worker thread off the event loop"""
+    payload, status = await asyncio.to_thread(transcribe_voice)
+    return jsonify(payload), status
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the assistant as an ASGI app with async views")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    args = parser.parse_args()
+    
+    config = Config()
+    config.bind = [f"{args.host}:{args.port}"]
+    print(f"Serving on http://{args.host}:{args.port}")
+    asyncio.run(serve(app, config))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import json
+import time
+
+from chat_session import ChatSessionManager, DEFAULT_ACKNOWLEDGEMENT
+from stub_model import StubModel
+
+SYSTEM_PROMPT = """You are a computer expert assistant specializing in macOS and zsh terminal commands.
+When users ask you to perform tasks, respond with the exact terminal command(s) needed.
+Format your commands in code blocks using ```bash or just provide the raw command.
+Always assume macOS with zsh shell.
+Be concise and precise."""
+
+
+def make_message(turn):
+    """A realistic user turn of roughly constant size"""
+    return f"Turn {turn}: list the five largest files in ~/Downloads and show their sizes in megabytes"
+
+
+def run_rebuild(turns, model):
+    """The old pattern: a fresh chat built from the whole history on every message"""
+    history = []
+    results = []
+    
+    for turn in range(1, turns + 1):
+        message = make_message(turn)
+        primer = [
+            {'role': 'user', 'parts': [SYSTEM_PROMPT]},
+            {'role': 'model', 'parts': [DEFAULT_ACKNOWLEDGEMENT]}
+        ]
+        
+        start = time.perf_counter()
+        chat = model.start_chat(history=primer + history)
+        response = chat.send_message(message)
+        elapsed = time.perf_counter() - start
+        
+        handed_over = len(json.dumps(primer + history + [message]).encode('utf-8'))
+        history.append({'role': 'user', 'parts': [message]})
+        history.append({'role': 'model', 'parts': [response.text]})
+        results.append((turn, handed_over, model.requests[-1]['bytes'], elapsed, elapsed))
+    
+    return results, None
+
+
+def run_sessions(turns, model, stream=False, **window_options):
+    """The session manager: one live chat, only the new turn is handed over"""
+    sessions = ChatSessionManager(model, SYSTEM_PROMPT, **window_options)
+    results = []
+    
+    for turn in range(1, turns + 1):
+        message = make_message(turn)
+        start = time.perf_counter()
+        if stream:
+            first_chunk = None
+            for _ in sessions.stream_message('bench', message):
+                if first_chunk is None:
+                    first_chunk = time.perf_counter() - start
+        else:
+            sessions.send_message('bench', message)
+        elapsed = time.perf_counter() - start
+        if not stream:
+            first_chunk = elapsed
+        results.append((turn, len(json.dumps([message]).encode('utf-8')), model.requests[-1]['bytes'],
+                        first_chunk, elapsed))
+    
+    return results, sessions.window_stats('bench')
+
+
+def print_results(results, report_every):
+    print(f"  {'turn':>5} {'handed to client':>17} {'sent to model':>14} {'first text ms':>14} {'latency ms':>11}")
+    for turn, handed_over, sent, first_chunk, elapsed in results:
+        if turn == 1 or turn % report_every == 0:
+            print(f"  {turn:>5} {handed_over:>15,} B {sent:>12,} B {first_chunk * 1000:>14.1f} {elapsed * 1000:>11.1f}")
+    
+    total_sent = sum(result[2] for result in results)
+    total_first = sum(result[3] for result in results)
+    total_time = sum(result[4] for result in results)
+    print(f"  total sent to model: {total_sent:,} B   mean time to first text: "
+          f"{total_first / len(results) * 1000:.1f} ms   mean latency: {total_time / len(results) * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-turn payload size and latency against a stub model")
+    parser.add_argument('--turns', type=int, default=40)
+    parser.add_argument('--base-latency', type=float, default=0.02, help="stub round trip in seconds")
+    parser.add_argument('--seconds-per-kb', type=float, default=0.002, help="stub cost per kilobyte sent")
+    parser.add_argument('--chunk-latency', type=float, default=0.02, help="stub delay between streamed chunks")
+    parser.add_argument('--report-every', type=int, default=10)
+    parser.add_argument('--max-context-chars', type=int, default=3000, help="context budget for the windowed run")
+    parser.add_argument('--keep-turns', type=int, default=6, help="exchanges kept verbatim in the windowed run")
+    parser.add_argument('--summary-chars', type=int, default=800, help="rolling summary budget in the windowed run")
+    args = parser.parse_args()
+    
+    runs = [
+        ("rebuild chat every message", run_rebuild),
+        ("persistent chat session, unbounded history",
+         lambda turns, model: run_sessions(turns, model, max_context_chars=None)),
+        ("persistent chat session, windowed history",
+         lambda turns, model: run_sessions(turns, model, max_context_chars=args.max_context_chars,
+                                           keep_turns=args.keep_turns, summary_chars=args.summary_chars)),
+        ("persistent chat session, windowed history, streamed",
+         lambda turns, model: run_sessions(turns, model, stream=True, max_context_chars=args.max_context_chars,
+                                           keep_turns=args.keep_turns, summary_chars=args.summary_chars))
+    ]
+    for label, run in runs:
+        model = StubModel(base_latency=args.base_latency, seconds_per_kb=args.seconds_per_kb,
+                          chunk_latency=args.chunk_latency)
+        results, window = run(args.turns, model)
+        print(f"\n{label}")
+        print_results(results, args.report_every)
+        if window is not None:
+            print(f"  context window: {window}")
+
+
+if __name__ == '__main__':
+    main()
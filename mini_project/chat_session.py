@@ -0,0 +1,265 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+
+from context_window import ContextWindow
+
+
+DEFAULT_ACKNOWLEDGEMENT = 'Understood. I will provide zsh terminal commands for macOS tasks.'
+
+
+class ChatSessionManager:
+    """Keep one live chat object per conversation and send only the new turn.
+    
+    With max_context_chars set, each session's history is a ContextWindow: the last
+    keep_turns exchanges stay verbatim and older ones are folded into a rolling summary,
+    so request size stays bounded however long the conversation runs.
+    
+    Only live sessions keep their transcript in memory. Evicted ones are rebuilt from
+    store_dir; without a store_dir an evicted conversation starts over.
+    """
+    
+    def __init__(self, model, system_prompt, acknowledgement=DEFAULT_ACKNOWLEDGEMENT,
+                 store_dir=None, max_sessions=64, max_context_chars=12000, keep_turns=6,
+                 summary_chars=2000):
+        self.model = model
+        self.primer = [
+            {'role': 'user', 'parts': [system_prompt]},
+            {'role': 'model', 'parts': [acknowledgement]}
+        ]
+        self.store_dir = store_dir
+        self.max_sessions = max_sessions
+        self.max_context_chars = max_context_chars
+        self.keep_turns = keep_turns
+        self.summary_chars = summary_chars
+        self.sessions = OrderedDict()
+        self.transcripts = {}
+        self.lock = threading.Lock()
+        self.created = 0
+        self.rebuilt = 0
+        self.turns = 0
+        self.bytes_handed_over = 0
+        self.total_latency = 0.0
+        self.total_first_chunk = 0.0
+        self.recent_turns = deque(maxlen=100)
+        
+        if store_dir:
+            os.makedirs(store_dir, exist_ok=True)
+    
+    def _transcript_path(self, conversation_id):
+        """Transcript file for a conversation: a readable prefix plus a hash, so distinct ids never share a file"""
+        safe_id = re.sub(r'[^A-Za-z0-9_.-]', '_', conversation_id)[:40]
+        digest = hashlib.sha256(conversation_id.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.store_dir, f"{safe_id}-{digest}.jsonl")
+    
+    def load_transcript(self, conversation_id):
+        """Turns recorded for a conversation: the live session's copy, otherwise read from disk"""
+        with self.lock:
+            turns = self.transcripts.get(conversation_id)
+            if turns is not None:
+                return list(turns)
+        return self._read_transcript(conversation_id)
+    
+    def _read_transcript(self, conversation_id):
+        if not self.store_dir or not os.path.exists(self._transcript_path(conversation_id)):
+            return []
+        with open(self._transcript_path(conversation_id)) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    
+    def _record_turns(self, conversation_id, turns):
+        with self.lock:
+            if conversation_id in self.transcripts:
+                self.transcripts[conversation_id].extend(turns)
+        if self.store_dir:
+            with open(self._transcript_path(conversation_id), 'a') as f:
+                for turn in turns:
+                    f.write(json.dumps(turn) + '\n')
+    
+    def get_session(self, conversation_id):
+        """Return the live chat for a conversation, rebuilding it only if it is not in memory"""
+        with self.lock:
+            session = self.sessions.get(conversation_id)
+            if session is not None:
+                self.sessions.move_to_end(conversation_id)
+                return session
+            
+            # Not live (first message, restart or eviction): rebuild once from the transcript
+            history = self._read_transcript(conversation_id)
+            self.transcripts[conversation_id] = history
+            window = self._new_window()
+            if window is not None:
+                window.add_turns(history)
+            session = {
+                'chat': self.model.start_chat(history=self.primer + (window.history() if window else history)),
+                'window': window,
+                'lock': threading.Lock(),
+                'async_lock': asyncio.Lock()
+            }
+            if history:
+                self.rebuilt += 1
+            else:
+                self.created += 1
+            
+            self.sessions[conversation_id] = session
+            while len(self.sessions) > self.max_sessions:
+                evicted_id, _ = self.sessions.popitem(last=False)
+                self.transcripts.pop(evicted_id, None)
+            return session
+    
+    def send_message(self, conversation_id, message):
+        """Send one new turn on the conversation's live chat and return the response text"""
+        session = self.get_session(conversation_id)
+        
+        # Turns within one conversation must reach the chat in order
+        with session['lock']:
+            start = time.perf_counter()
+            response = session['chat'].send_message(message)
+            response_text = response.text
+            elapsed = time.perf_counter() - start
+            self._finish_turn(conversation_id, session, message, response_text)
+        
+        self._record_stats(conversation_id, message, elapsed, elapsed)
+        return response_text
+    
+    def stream_message(self, conversation_id, message):
+        """Send one new turn and yield the response text chunk by chunk as the model produces it"""
+        session = self.get_session(conversation_id)
+        
+        with session['lock']:
+            start = time.perf_counter()
+            first_chunk = None
+            parts = []
+            try:
+                for chunk in session['chat'].send_message(message, stream=True):
+                    if first_chunk is None:
+                        first_chunk = time.perf_counter() - start
+                    parts.append(chunk.text)
+                    yield chunk.text
+            except BaseException:
+                self._drop_session(conversation_id, session)
+                raise
+            
+            response_text = ''.join(parts)
+            elapsed = time.perf_counter() - start
+            self._finish_turn(conversation_id, session, message, response_text)
+        
+        self._record_stats(conversation_id, message, elapsed, first_chunk if first_chunk is not None else elapsed)
+    
+    async def send_message_async(self, conversation_id, message):
+        """Async version of send_message for the ASGI app"""
+        return ''.join([text async for text in self.stream_message_async(conversation_id, message)])
+    
+    async def stream_message_async(self, conversation_id, message):
+        """Async version of stream_message: waiting on the model or the transcript never blocks the event loop"""
+        session = await asyncio.to_thread(self.get_session, conversation_id)
+        
+        async with session['async_lock']:
+            start = time.perf_counter()
+            first_chunk = None
+            parts = []
+            try:
+                response = await session['chat'].send_message_async(message, stream=True)
+                async for chunk in response:
+                    if first_chunk is None:
+                        first_chunk = time.perf_counter() - start
+                    parts.append(chunk.text)
+                    yield chunk.text
+            except BaseException:
+                self._drop_session(conversation_id, session)
+                raise
+            
+            response_text = ''.join(parts)
+            elapsed = time.perf_counter() - start
+            await asyncio.to_thread(self._finish_turn, conversation_id, session, message, response_text)
+        
+        self._record_stats(conversation_id, message, elapsed, first_chunk if first_chunk is not None else elapsed)
+    
+    def _finish_turn(self, conversation_id, session, message, response_text):
+        self._record_turns(conversation_id, [
+            {'role': 'user', 'parts': [message]},
+            {'role': 'model', 'parts': [response_text]}
+        ])
+        
+        # Older turns were folded into the summary: reseed the chat with the compact history
+        window = session['window']
+        if window is not None and window.add_exchange(message, response_text):
+            session['chat'] = self.model.start_chat(history=self.primer + window.history())
+    
+    def _record_stats(self, conversation_id, message, elapsed, first_chunk):
+        # Only the new message is handed to the chat object; the client library still
+        # replays the session's (compacted) history to the model on every turn
+        bytes_handed_over = len(message.encode('utf-8'))
+        with self.lock:
+            self.turns += 1
+            self.bytes_handed_over += bytes_handed_over
+            self.total_latency += elapsed
+            self.total_first_chunk += first_chunk
+            self.recent_turns.append({
+                'conversation_id': conversation_id,
+                'bytes_handed_over': bytes_handed_over,
+                'first_chunk_seconds': first_chunk,
+                'seconds': elapsed
+            })
+    
+    def _drop_session(self, conversation_id, session):
+        # A stream abandoned halfway leaves the chat unusable: drop it, the transcript rebuilds it
+        with self.lock:
+            if self.sessions.get(conversation_id) is session:
+                del self.sessions[conversation_id]
+                self.transcripts.pop(conversation_id, None)
+    
+    def _new_window(self):
+        if self.max_context_chars is None:
+            return None
+        return ContextWindow(max_chars=self.max_context_chars, keep_turns=self.keep_turns,
+                             summary_chars=self.summary_chars)
+    
+    def window_stats(self, conversation_id):
+        """Context size and compaction counts for one live conversation"""
+        session = self.sessions.get(conversation_id)
+        if session is None or session['window'] is None:
+            return None
+        return session['window'].stats()
+    
+    def history(self, conversation_id):
+        """All recorded turns of a conversation"""
+        return self.load_transcript(conversation_id)
+    
+    def reset(self, conversation_id):
+        """Forget a conversation, including its transcript on disk"""
+        with self.lock:
+            self.sessions.pop(conversation_id, None)
+            self.transcripts.pop(conversation_id, None)
+            if self.store_dir and os.path.exists(self._transcript_path(conversation_id)):
+                os.remove(self._transcript_path(conversation_id))
+    
+    def stats(self):
+        """Session counts, new-message bytes per turn, latency and time to first chunk, and context compaction totals"""
+        with self.lock:
+            return self._stats()
+    
+    def _stats(self):
+        windows = [session['window'] for session in self.sessions.values() if session['window'] is not None]
+        return {
+            'live_sessions': len(self.sessions),
+            'created': self.created,
+            'rebuilt': self.rebuilt,
+            'turns': self.turns,
+            'bytes_handed_over': self.bytes_handed_over,
+            'mean_latency': self.total_latency / self.turns if self.turns else 0.0,
+            'mean_first_chunk': self.total_first_chunk / self.turns if self.turns else 0.0,
+            'recent_turns': list(self.recent_turns),
+            'context': {
+                'max_chars': self.max_context_chars,
+                'keep_turns': self.keep_turns,
+                'summary_chars': self.summary_chars,
+                'compactions': sum(window.compactions for window in windows),
+                'folded_exchanges': sum(window.folded_exchanges for window in windows),
+                'folded_chars': sum(window.folded_chars for window in windows)
+            }
+        }
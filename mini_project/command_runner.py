@@ -0,0 +1,365 @@
+import asyncio
+import codecs
+import os
+import queue
+import re
+import selectors
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Programs that only read state: neighbouring commands made of these can run side by side
+READ_ONLY_PROGRAMS = {
+    'cat', 'cut', 'date', 'df', 'du', 'echo', 'file', 'grep', 'head', 'hostname', 'id', 'lsof',
+    'ls', 'pgrep', 'ps', 'pwd', 'stat', 'sw_vers', 'tail', 'top', 'uname', 'uniq', 'uptime',
+    'vm_stat', 'wc', 'which', 'whoami'
+}
+
+
+def is_parallel_safe(command):
+    """True if every program in the command line only reads: no redirection, subshell, process substitution or '&' job"""
+    if re.search(r'>|`|\$\(|<\(|(?<!&)&(?!&)', command):
+        return False
+    for segment in re.split(r'\|\|?|&&|;', command):
+        words = segment.split()
+        if not words or words[0] not in READ_ONLY_PROGRAMS:
+            return False
+    return True
+
+
+def plan_stages(commands):
+    """Group command indices into stages that run one after another.
+    
+    Consecutive read-only commands share a stage and run concurrently; any other
+    command gets a stage of its own, so it sees everything before it finished.
+    """
+    stages = []
+    for index, command in enumerate(commands):
+        if is_parallel_safe(command) and stages and stages[-1][1]:
+            stages[-1][0].append(index)
+        else:
+            stages.append(([index], is_parallel_safe(command)))
+    return [indices for indices, _ in stages]
+
+
+def clip_output(text, emitted, limit):
+    """Cut text so a command never sends more than limit characters; returns (text, new total)"""
+    if emitted >= limit:
+        return '', emitted
+    text = text[:limit - emitted]
+    emitted += len(text)
+    if emitted >= limit:
+        text += '\n… output truncated'
+    return text, emitted
+
+
+def kill_process_group(pid):
+    """Kill a command started in its own session together with anything it started"""
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _kill_spawned(spawn):
+    if not spawn.cancelled() and spawn.exception() is None:
+        kill_process_group(spawn.result().pid)
+
+
+class CommandRunner:
+    """Run the commands of one response with a shared, bounded worker pool.
+    
+    Output is reported as events while commands run. Each command has its own time
+    budget and all commands of one response share a total budget.
+    """
+    
+    def __init__(self, max_workers=4, command_timeout=30, total_timeout=90, shell='/bin/zsh',
+                 cwd=None, max_output_chars=20000):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='command')
+        self.max_workers = max_workers
+        self.command_timeout = command_timeout
+        self.total_timeout = total_timeout
+        self.shell = shell
+        self.cwd = cwd or os.path.expanduser('~')
+        self.max_output_chars = max_output_chars
+    
+    def stream(self, commands):
+        """Yield queued/start/output/exit events for the commands as they happen.
+        
+        Every command gets a 'queued' event first, in order. Closing the generator
+        early kills whatever is still running.
+        """
+        events = queue.Queue()
+        cancel = threading.Event()
+        deadline = time.monotonic() + self.total_timeout
+        
+        for index, command in enumerate(commands):
+            yield {'type': 'queued', 'index': index, 'command': command, 'parallel': is_parallel_safe(command)}
+        
+        def schedule():
+            try:
+                for stage in plan_stages(commands):
+                    futures = [self.executor.submit(self._run_one, index, commands[index], deadline, events.put, cancel)
+                               for index in stage]
+                    for future in futures:
+                        future.result()
+            finally:
+                events.put(None)
+        
+        threading.Thread(target=schedule, daemon=True).start()
+        try:
+            while True:
+                event = events.get()
+                if event is None:
+                    return
+                yield event
+        finally:
+            cancel.set()
+    
+    def run_all(self, commands):
+        """Run the commands and return one {'command', 'output', ...} result per command, in order"""
+        results = [{'command': command, 'output': ''} for command in commands]
+        for event in self.stream(commands):
+            result = results[event['index']]
+            if event['type'] == 'output':
+                result['output'] += event['text']
+            elif event['type'] == 'exit':
+                output = result['output'].strip()
+                result['output'] = '\n'.join(part for part in (output, event['note']) if part)
+                result.update(status=event['status'], returncode=event['returncode'], seconds=event['seconds'])
+        return results
+    
+    def _run_one(self, index, command, deadline, emit, cancel):
+        start = time.monotonic()
+        
+        def finish(status, returncode=None, note=''):
+            emit({'type': 'exit', 'index': index, 'status': status, 'returncode': returncode,
+                  'seconds': time.monotonic() - start, 'note': note})
+        
+        if cancel.is_set():
+            return finish('cancelled', note='⚠ Cancelled')
+        budget = min(self.command_timeout, deadline - start)
+        if budget <= 0:
+            return finish('skipped', note=f"⚠ Skipped: all commands share a {self.total_timeout} second budget")
+        
+        emit({'type': 'start', 'index': index})
+        try:
+            if command.strip().startswith('open'):
+                # Apps opened this way keep running on their own
+                subprocess.Popen(
+                    command,
+                    shell=True,
+                    executable=self.shell,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
+                return finish('ok', 0, f"✓ Opened: {command.replace('open ', '')}")
+            
+            process = subprocess.Popen(
+                command,
+                shell=True,
+                executable=self.shell,
+                cwd=self.cwd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                start_new_session=True
+            )
+        except Exception as e:
+            return finish('error', note=f"✗ Error: {str(e)}")
+        
+        status, emitted = self._pump_output(process, index, start + budget, emit, cancel)
+        if status is None:
+            try:
+                process.wait(timeout=max(start + budget - time.monotonic(), 0))
+            except subprocess.TimeoutExpired:
+                status = 'timeout'
+        if status is not None:
+            self._kill(process)
+        
+        if status == 'timeout':
+            return finish('timeout', process.returncode, f"⚠ Command timed out after {budget:.0f} seconds")
+        if status == 'cancelled':
+            return finish('cancelled', process.returncode, '⚠ Cancelled')
+        if process.returncode == 0:
+            return finish('ok', 0, '' if emitted else '✓ Command executed successfully')
+        return finish('error', process.returncode, '' if emitted else f"✗ Exited with status {process.returncode}")
+    
+    def _pump_output(self, process, index, deadline, emit, cancel):
+        """Forward stdout/stderr as they are written; returns ('timeout'/'cancelled'/None, chars sent)"""
+        selector = selectors.DefaultSelector()
+        decoders = {}
+        for name, pipe in (('stdout', process.stdout), ('stderr', process.stderr)):
+            selector.register(pipe, selectors.EVENT_READ, name)
+            decoders[name] = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        
+        emitted = 0
+        status = None
+        try:
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    status = 'timeout'
+                    break
+                if cancel.is_set():
+                    status = 'cancelled'
+                    break
+                
+                # Wake up at least every 100 ms to notice cancellation
+                for key, _ in selector.select(min(remaining, 0.1)):
+                    data = os.read(key.fileobj.fileno(), 4096)
+                    if not data:
+                        selector.unregister(key.fileobj)
+                        continue
+                    
+                    text, emitted = clip_output(decoders[key.data].decode(data), emitted, self.max_output_chars)
+                    if text:
+                        emit({'type': 'output', 'index': index, 'stream': key.data, 'text': text})
+        finally:
+            selector.close()
+            process.stdout.close()
+            process.stderr.close()
+        return status, emitted
+    
+    @staticmethod
+    def _kill(process):
+        kill_process_group(process.pid)
+        process.wait()
+
+
+class AsyncCommandRunner:
+    """CommandRunner for the ASGI app: the same stages, events and budgets, run as asyncio subprocesses.
+    
+    No thread waits on a command; a semaphore bounds how many run at once.
+    """
+    
+    def __init__(self, max_workers=4, command_timeout=30, total_timeout=90, shell='/bin/zsh',
+                 cwd=None, max_output_chars=20000):
+        self.slots = asyncio.Semaphore(max_workers)
+        self.max_workers = max_workers
+        self.command_timeout = command_timeout
+        self.total_timeout = total_timeout
+        self.shell = shell
+        self.cwd = cwd or os.path.expanduser('~')
+        self.max_output_chars = max_output_chars
+    
+    async def stream(self, commands):
+        """Async version of CommandRunner.stream"""
+        events = asyncio.Queue()
+        deadline = time.monotonic() + self.total_timeout
+        
+        for index, command in enumerate(commands):
+            yield {'type': 'queued', 'index': index, 'command': command, 'parallel': is_parallel_safe(command)}
+        
+        async def schedule():
+            try:
+                for stage in plan_stages(commands):
+                    await asyncio.gather(*(self._run_one(index, commands[index], deadline, events.put_nowait)
+                                           for index in stage))
+            finally:
+                events.put_nowait(None)
+        
+        task = asyncio.create_task(schedule())
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    return
+                yield event
+        finally:
+            # Cancelling kills whatever is still running
+            task.cancel()
+    
+    async def run_all(self, commands):
+        """Async version of CommandRunner.run_all"""
+        results = [{'command': command, 'output': ''} for command in commands]
+        async for event in self.stream(commands):
+            result = results[event['index']]
+            if event['type'] == 'output':
+                result['output'] += event['text']
+            elif event['type'] == 'exit':
+                output = result['output'].strip()
+                result['output'] = '\n'.join(part for part in (output, event['note']) if part)
+                result.update(status=event['status'], returncode=event['returncode'], seconds=event['seconds'])
+        return results
+    
+    async def _run_one(self, index, command, deadline, emit):
+        start = time.monotonic()
+        
+        def finish(status, returncode=None, note=''):
+            emit({'type': 'exit', 'index': index, 'status': status, 'returncode': returncode,
+                  'seconds': time.monotonic() - start, 'note': note})
+        
+        async with self.slots:
+            budget = min(self.command_timeout, deadline - time.monotonic())
+            if budget <= 0:
+                return finish('skipped', note=f"⚠ Skipped: all commands share a {self.total_timeout} second budget")
+            
+            emit({'type': 'start', 'index': index})
+            try:
+                if command.strip().startswith('open'):
+                    subprocess.Popen(
+                        command,
+                        shell=True,
+                        executable=self.shell,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL
+                    )
+                    return finish('ok', 0, f"✓ Opened: {command.replace('open ', '')}")
+                
+                spawn = asyncio.ensure_future(asyncio.create_subprocess_shell(
+                    command,
+                    executable=self.shell,
+                    cwd=self.cwd,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    start_new_session=True
+                ))
+                try:
+                    process = await asyncio.shield(spawn)
+                except asyncio.CancelledError:
+                    # Cancelled mid-spawn: let the spawn finish, then stop the new process
+                    spawn.add_done_callback(_kill_spawned)
+                    raise
+            except Exception as e:
+                return finish('error', note=f"✗ Error: {str(e)}")
+            
+            emitted = 0
+            
+            async def pump(stream, name):
+                nonlocal emitted
+                decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+                while True:
+                    data = await stream.read(4096)
+                    if not data:
+                        return
+                    text, emitted = clip_output(decoder.decode(data), emitted, self.max_output_chars)
+                    if text:
+                        emit({'type': 'output', 'index': index, 'stream': name, 'text': text})
+            
+            tasks = [
+                asyncio.ensure_future(pump(process.stdout, 'stdout')),
+                asyncio.ensure_future(pump(process.stderr, 'stderr')),
+                asyncio.ensure_future(process.wait())
+            ]
+            pending = tasks
+            try:
+                _, pending = await asyncio.wait(tasks, timeout=budget)
+            finally:
+                # Out of time or cancelled: stop the command and anything it started, then let its pipes close
+                if pending:
+                    kill_process_group(process.pid)
+                    _, stuck = await asyncio.wait(pending, timeout=1)
+                    for task in stuck:
+                        task.cancel()
+            
+            if pending:
+                return finish('timeout', process.returncode, f"⚠ Command timed out after {budget:.0f} seconds")
+        
+        if process.returncode == 0:
+            return finish('ok', 0, '' if emitted else '✓ Command executed successfully')
+        return finish('error', process.returncode, '' if emitted else f"✗ Exited with status {process.returncode}")
@@ -0,0 +1,110 @@
+import re
+
+
+class ContextWindow:
+    """Keep the last turns verbatim and fold older turns into a rolling compact summary.
+    
+    Sizes are measured in characters (roughly 4 characters per token).
+    """
+    
+    def __init__(self, max_chars=12000, keep_turns=6, summary_chars=2000, compact_every=4,
+                 summarizer=None):
+        self.max_chars = max_chars
+        self.keep_turns = keep_turns
+        self.summary_chars = summary_chars
+        self.compact_every = compact_every
+        self.summarizer = summarizer or summarize_exchanges
+        self.summary_lines = []
+        self.omitted = 0
+        self.exchanges = []
+        self.compactions = 0
+        self.folded_exchanges = 0
+        self.folded_chars = 0
+    
+    def add_exchange(self, user_text, model_text):
+        """Record one user message and the model's reply; returns True if the window compacted"""
+        self.exchanges.append((user_text, model_text))
+        if (len(self.exchanges) > self.keep_turns + self.compact_every
+                or self.context_chars() > self.max_chars):
+            return self.compact()
+        return False
+    
+    def add_turns(self, turns):
+        """Load user/model turns (e.g. a transcript after restart), compacting as needed"""
+        for user_turn, model_turn in zip(turns[0::2], turns[1::2]):
+            self.exchanges.append((user_turn['parts'][0], model_turn['parts'][0]))
+        if self.exchanges:
+            self.compact()
+    
+    def compact(self):
+        """Fold the oldest exchanges into the summary until the window fits the budget"""
+        fold = max(len(self.exchanges) - self.keep_turns, 0)
+        verbatim_budget = max(self.max_chars - self.summary_chars, 0)
+        while fold < len(self.exchanges) - 1 and self._chars(self.exchanges[fold:]) > verbatim_budget:
+            fold += 1
+        if fold == 0:
+            return False
+        
+        folded, self.exchanges = self.exchanges[:fold], self.exchanges[fold:]
+        self.summary_lines.extend(self.summarizer(folded))
+        
+        # Rolling summary: the oldest lines fall off once it outgrows its own budget
+        while len(self.summary_lines) > 1 and len('\n'.join(self.summary_lines)) > self.summary_chars:
+            self.summary_lines.pop(0)
+            self.omitted += 1
+        
+        self.compactions += 1
+        self.folded_exchanges += len(folded)
+        self.folded_chars += self._chars(folded)
+        return True
+    
+    def summary(self):
+        if not self.summary_lines:
+            return ''
+        lines = list(self.summary_lines)
+        if self.omitted:
+            lines.insert(0, f"- ({self.omitted} earlier exchanges omitted)")
+        return '\n'.join(lines)
+    
+    def history(self):
+        """Turns to seed a chat with: the summary (if any) followed by the verbatim turns"""
+        turns = []
+        if self.summary_lines:
+            turns.append({'role': 'user', 'parts': [f"Summary of our earlier conversation:\n{self.summary()}"]})
+            turns.append({'role': 'model', 'parts': ['Noted, I will keep that context in mind.']})
+        for user_text, model_text in self.exchanges:
+            turns.append({'role': 'user', 'parts': [user_text]})
+            turns.append({'role': 'model', 'parts': [model_text]})
+        return turns
+    
+    @staticmethod
+    def _chars(exchanges):
+        return sum(len(user_text) + len(model_text) for user_text, model_text in exchanges)
+    
+    def context_chars(self):
+        return len(self.summary()) + self._chars(self.exchanges)
+    
+    def stats(self):
+        return {
+            'verbatim_turns': len(self.exchanges),
+            'context_chars': self.context_chars(),
+            'summary_chars': len(self.summary()),
+            'compactions': self.compactions,
+            'folded_exchanges': self.folded_exchanges,
+            'folded_chars': self.folded_chars
+        }
+
+
+def summarize_exchanges(exchanges):
+    """One short line per exchange: what was asked and which commands the answer gave"""
+    lines = []
+    for user_text, model_text in exchanges:
+        asked = ' '.join(user_text.split())[:120]
+        commands = [line.strip() for block in re.findall(r'```(?:bash|sh|zsh)?\n(.*?)```', model_text, re.DOTALL)
+                    for line in block.split('\n') if line.strip() and not line.strip().startswith('#')]
+        if commands:
+            answered = 'ran: ' + '; '.join(commands)[:160]
+        else:
+            answered = 'answered: ' + ' '.join(model_text.split())[:120]
+        lines.append(f"- asked \"{asked}\", {answered}")
+    return lines
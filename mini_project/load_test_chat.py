@@ -0,0 +1,137 @@
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+SERVERS = {
+    'flask': [sys.executable, '-c', "import sys; from app import app; app.run(port=int(sys.argv[1]), threaded=True)"],
+    'asgi': [sys.executable, 'asgi_app.py', '--port']
+}
+
+
+def run_chat(host, port, chat, turns, stream):
+    """One user: a conversation of several turns, each sent after the previous answer arrived"""
+    connection = http.client.HTTPConnection(host, port, timeout=120)
+    headers = {'Content-Type': 'application/json'}
+    conversation_id = f"load-{os.getpid()}-{chat}"
+    results = []
+    
+    for turn in range(turns):
+        body = json.dumps({'message': f"chat {chat} turn {turn}: show disk usage", 'conversation_id': conversation_id})
+        start = time.perf_counter()
+        first_text = None
+        connection.request('POST', '/api/chat/stream' if stream else '/api/chat', body=body, headers=headers)
+        response = connection.getresponse()
+        
+        if stream:
+            # Read server-sent events line by line; the first delta is what the user sees first
+            ok = response.status == 200
+            for line in iter(response.readline, b''):
+                if first_text is None and line.startswith(b'event: delta'):
+                    first_text = time.perf_counter() - start
+                if line.startswith(b'event: error'):
+                    ok = False
+                if line.startswith(b'event: done'):
+                    response.read()
+                    break
+        else:
+            ok = response.status == 200 and 'error' not in json.loads(response.read())
+        
+        elapsed = time.perf_counter() - start
+        results.append((ok, elapsed, first_text if first_text is not None else elapsed))
+    
+    connection.close()
+    return results
+
+
+def wait_for_port(host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server on {host}:{port} did not start within {timeout} seconds")
+
+
+def start_server(kind, port, args, store_dir):
+    """Launch app.py (threaded Flask) or asgi_app.py against the stub model"""
+    env = dict(os.environ, USE_STUB_MODEL='1', STUB_BASE_LATENCY=str(args.model_latency),
+               CHAT_STORE_DIR=store_dir, COMMAND_SHELL=args.shell, MODEL_CONCURRENCY=str(args.chats))
+    server = subprocess.Popen(SERVERS[kind] + [str(port)], cwd=HERE, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port('127.0.0.1', port)
+    except RuntimeError:
+        server.kill()
+        raise
+    return server
+
+
+def run_load(host, port, args):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.chats) as pool:
+        chats = pool.map(lambda chat: run_chat(host, port, chat, args.turns, args.stream), range(args.chats))
+        results = [result for chat in chats for result in chat]
+    return results, time.perf_counter() - start
+
+
+def print_results(label, results, elapsed, stream):
+    latencies = sorted(result[1] for result in results)
+    failed = sum(not result[0] for result in results)
+    p99 = latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)]
+    print(f"\n{label}")
+    print(f"  turns          {len(results):>10,}   ({failed} failed)")
+    print(f"  elapsed        {elapsed:>10.2f} s")
+    print(f"  turns/s        {len(results) / elapsed:>10.1f}")
+    print(f"  p50 latency    {statistics.median(latencies) * 1000:>10.1f} ms")
+    print(f"  p99 latency    {p99 * 1000:>10.1f} ms")
+    if stream:
+        print(f"  p50 first text {statistics.median(result[2] for result in results) * 1000:>10.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent chats against the assistant running on the stub model")
+    parser.add_argument('--url', help="load an already running server instead of starting one")
+    parser.add_argument('--server', choices=['flask', 'asgi', 'both'], default='both',
+                        help="which server to start against the stub model (default: both)")
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--chats', type=int, default=100, help="concurrent conversations (default: 100)")
+    parser.add_argument('--turns', type=int, default=5, help="turns per conversation (default: 5)")
+    parser.add_argument('--model-latency', type=float, default=0.5, help="stub model round trip in seconds")
+    parser.add_argument('--stream', action='store_true', help="use /api/chat/stream and report time to first text")
+    parser.add_argument('--shell', default='/bin/zsh', help="shell the server runs commands with")
+    args = parser.parse_args()
+    
+    if args.url:
+        url = urlparse(args.url)
+        results, elapsed = run_load(url.hostname, url.port or 80, args)
+        print_results(args.url, results, elapsed, args.stream)
+        return
+    
+    print(f"{args.chats} concurrent chats x {args.turns} turns, stub model latency {args.model_latency * 1000:.0f} ms")
+    for kind in (['flask', 'asgi'] if args.server == 'both' else [args.server]):
+        with tempfile.TemporaryDirectory() as store_dir:
+            server = start_server(kind, args.port, args, store_dir)
+            try:
+                results, elapsed = run_load('127.0.0.1', args.port, args)
+            finally:
+                server.terminate()
+                server.wait()
+        print_results('app.py (Flask, thread per request)' if kind == 'flask' else 'asgi_app.py (Quart, async views)',
+                      results, elapsed, args.stream)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,13 +8,19 @@ import os
 from dotenv import load_dotenv
 import subprocess
 import re
+from chat_session import ChatSessionManager
+from command_runner import CommandRunner
+from stub_model import StubModel
 
 # Load environment variables
 load_dotenv()
 
-# Configure Gemini API
-genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
-model = genai.GenerativeModel('gemini-2.5-flash')
+# Configure Gemini API (USE_STUB_MODEL=1 swaps in an offline stub for local measurements)
+if os.getenv('USE_STUB_MODEL'):
+    model = StubModel(base_latency=float(os.getenv('STUB_BASE_LATENCY', 0.05)))
+else:
+    genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
+    model = genai.GenerativeModel('gemini-2.5-flash')
 
 
 # System prompt for computer expert mode
@@ -64,7 +70,21 @@ class TransparentOverlay:
         self.setup_ui()
         self.recognizer = sr.Recognizer()
         self.is_listening = False
-        self.chat_history = []
+        self.sessions = ChatSessionManager(
+            model,
+            SYSTEM_PROMPT,
+            store_dir=os.path.join(os.path.dirname(os.path.abspath(__file__)), '.chat_sessions'),
+            max_context_chars=int(os.getenv('CHAT_CONTEXT_CHARS', 12000)),
+            keep_turns=int(os.getenv('CHAT_KEEP_TURNS', 6)),
+            summary_chars=int(os.getenv('CHAT_SUMMARY_CHARS', 2000))
+        )
+        self.conversation_id = 'overlay'
+        self.command_runner = CommandRunner(
+            max_workers=int(os.getenv('COMMAND_WORKERS', 4)),
+            command_timeout=int(os.getenv('COMMAND_TIMEOUT', 30)),
+            total_timeout=int(os.getenv('COMMAND_TOTAL_TIMEOUT', 90)),
+            shell=os.getenv('COMMAND_SHELL', '/bin/zsh')
+        )
         
     def start_move(self, event):
         self.drag_data["x"] = event.x
@@ -345,6 +365,12 @@ class TransparentOverlay:
             msg_label.pack(fill='x')
             
         self.on_frame_configure()
+        return msg_label
+        
+    def update_message_bubble(self, msg_label, text):
+        """Replace the text of a bubble that is still being streamed"""
+        msg_label.config(text=text)
+        self.on_frame_configure()
         
     def add_system_message(self, text):
         """Add a centered system message"""
@@ -372,12 +398,6 @@ class TransparentOverlay:
         self.input_text.delete('1.0', 'end')
         self.add_message_bubble(message, 'user')
         
-        # Add to chat history
-        self.chat_history.append({
-            'role': 'user',
-            'parts': [message]
-        })
-        
         # Get AI response in background
         threading.Thread(target=self.get_ai_response, args=(message,), daemon=True).start()
         
@@ -406,69 +426,42 @@ class TransparentOverlay:
         
         return commands
         
-    def execute_command(self, command):
-        """Execute shell command and return output"""
-        try:
-            # For 'open' commands, run in background
-            if command.strip().startswith('open'):
-                subprocess.Popen(
-                    command,
-                    shell=True,
-                    executable='/bin/zsh',
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
-                )
-                return f"✓ Opened: {command.replace('open ', '')}"
-            
-            # For other commands, capture output
-            result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=30,
-                executable='/bin/zsh',
-                cwd=os.path.expanduser('~')
-            )
-            
-            output = result.stdout + result.stderr
-            return output.strip() if output.strip() else "✓ Command executed successfully"
-        except subprocess.TimeoutExpired:
-            return "⚠ Command timed out after 30 seconds"
-        except Exception as e:
-            return f"✗ Error: {str(e)}"
-        
     def get_ai_response(self, message):
         """Get response from Gemini AI"""
         try:
             self.add_system_message("⏳ Thinking...")
             
-            # Create chat with system prompt
-            chat = model.start_chat(history=[
-                {'role': 'user', 'parts': [SYSTEM_PROMPT]},
-                {'role': 'model', 'parts': ['Understood. I will provide zsh terminal commands for macOS tasks.']}
-            ] + self.chat_history[:-1])
-            
-            response = chat.send_message(message)
-            response_text = response.text
+            # Only the new turn is sent; the reply grows in one bubble as chunks arrive
+            parts = []
+            ai_label = None
+            for text in self.sessions.stream_message(self.conversation_id, message):
+                parts.append(text)
+                if ai_label is None:
+                    ai_label = self.add_message_bubble(''.join(parts), 'ai')
+                else:
+                    self.root.after(0, self.update_message_bubble, ai_label, ''.join(parts))
+            response_text = ''.join(parts)
+            if ai_label is None:
+                self.add_message_bubble(response_text, 'ai')
             
-            # Add AI response to history
-            self.chat_history.append({
-                'role': 'model',
-                'parts': [response_text]
-            })
-            
-            self.add_message_bubble(response_text, 'ai')
-            
-            # Extract and execute commands
-            commands = self.extract_commands(response_text)
-            if commands:
-                for cmd in commands:
-                    if cmd.strip():
-                        self.add_message_bubble(cmd, 'command')
-                        output = self.execute_command(cmd)
-                        if output:
-                            self.add_message_bubble(output, 'output')
+            # Extract and execute commands; each output bubble fills in while its command runs
+            commands = [cmd for cmd in self.extract_commands(response_text) if cmd.strip()]
+            output_labels = {}
+            outputs = {}
+            for event in self.command_runner.stream(commands):
+                index = event['index']
+                if event['type'] == 'queued':
+                    self.add_message_bubble(event['command'], 'command')
+                    output_labels[index] = self.add_message_bubble('⏳ Queued', 'output')
+                    outputs[index] = ''
+                elif event['type'] == 'start':
+                    self.root.after(0, self.update_message_bubble, output_labels[index], '⏳ Running...')
+                elif event['type'] == 'output':
+                    outputs[index] += event['text']
+                    self.root.after(0, self.update_message_bubble, output_labels[index], outputs[index].strip())
+                elif event['type'] == 'exit':
+                    text = '\n'.join(part for part in (outputs[index].strip(), event['note']) if part)
+                    self.root.after(0, self.update_message_bubble, output_labels[index], text)
             
             # Generate speech for AI response
             threading.Thread(target=self.speak_response, args=(response_text,), daemon=True).start()
@@ -510,12 +503,6 @@ class TransparentOverlay:
             self.input_text.insert('1.0', text)
             self.add_message_bubble(text, 'user')
             
-            # Add to chat history
-            self.chat_history.append({
-                'role': 'user',
-                'parts': [text]
-            })
-            
             # Auto-send
             threading.Thread(target=self.get_ai_response, args=(text,), daemon=True).start()
             
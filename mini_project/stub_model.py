@@ -0,0 +1,172 @@
+import asyncio
+import json
+import re
+import shlex
+import threading
+import time
+
+
+class StubResponse:
+    """Response object with the same .text attribute as a Gemini response"""
+    
+    def __init__(self, text):
+        self.text = text
+
+
+class StubStreamResponse:
+    """Streaming response: iterate for chunks, .text is the full reply once iteration finished"""
+    
+    def __init__(self, chunks, on_complete=None):
+        self._chunks = chunks
+        self._on_complete = on_complete
+        self._parts = []
+        self.done = False
+    
+    def __iter__(self):
+        for chunk in self._chunks:
+            self._parts.append(chunk.text)
+            yield chunk
+        self.done = True
+        if self._on_complete is not None:
+            self._on_complete(self.text)
+    
+    @property
+    def text(self):
+        return ''.join(self._parts)
+
+
+class StubAsyncStreamResponse(StubStreamResponse):
+    """Streaming response for send_message_async: iterate with async for"""
+    
+    async def __aiter__(self):
+        async for chunk in self._chunks:
+            self._parts.append(chunk.text)
+            yield chunk
+        self.done = True
+        if self._on_complete is not None:
+            self._on_complete(self.text)
+
+
+class StubChat:
+    """Chat object with the same send_message/history interface as a Gemini ChatSession"""
+    
+    def __init__(self, model, history=None):
+        self.model = model
+        self.history = [dict(turn) for turn in (history or [])]
+    
+    def send_message(self, content, stream=False):
+        contents = self.history + [{'role': 'user', 'parts': [content]}]
+        
+        if stream:
+            # Like the real ChatSession, history only advances once the stream was read to the end
+            def on_complete(text):
+                self.history = contents + [{'role': 'model', 'parts': [text]}]
+            return StubStreamResponse(self.model.generate_content(contents, stream=True), on_complete)
+        
+        response = self.model.generate_content(contents)
+        self.history = contents + [{'role': 'model', 'parts': [response.text]}]
+        return response
+    
+    async def send_message_async(self, content, stream=False):
+        contents = self.history + [{'role': 'user', 'parts': [content]}]
+        
+        if stream:
+            def on_complete(text):
+                self.history = contents + [{'role': 'model', 'parts': [text]}]
+            return StubAsyncStreamResponse(await self.model.generate_content_async(contents, stream=True), on_complete)
+        
+        response = await self.model.generate_content_async(contents)
+        self.history = contents + [{'role': 'model', 'parts': [response.text]}]
+        return response
+
+
+class StubModel:
+    """Offline stand-in for genai.GenerativeModel that records request size and latency.
+    
+    Like the real API, every request carries the full list of contents it was given.
+    Latency is a fixed round trip plus a cost per kilobyte sent; streamed replies then
+    arrive a few words at a time, chunk_latency apart.
+    """
+    
+    def __init__(self, base_latency=0.05, seconds_per_kb=0.002, chunk_latency=0.02, words_per_chunk=3):
+        self.base_latency = base_latency
+        self.seconds_per_kb = seconds_per_kb
+        self.chunk_latency = chunk_latency
+        self.words_per_chunk = words_per_chunk
+        self.requests = []
+        self.lock = threading.Lock()
+    
+    def start_chat(self, history=None):
+        return StubChat(self, history)
+    
+    def reply_for(self, prompt):
+        """Canned answer with one command, so command extraction has something to run"""
+        return f"Sure, here is the command:\n```bash\necho {shlex.quote(prompt[:80])}\n```"
+    
+    def generate_content(self, contents, stream=False):
+        payload_bytes, text = self._prepare(contents)
+        if stream:
+            return self._stream(text, payload_bytes)
+        
+        start = time.perf_counter()
+        time.sleep(self._full_latency(text, payload_bytes))
+        elapsed = time.perf_counter() - start
+        self._record(payload_bytes, elapsed, elapsed)
+        return StubResponse(text)
+    
+    async def generate_content_async(self, contents, stream=False):
+        """Same as generate_content, but waits with asyncio.sleep so other requests keep running"""
+        payload_bytes, text = self._prepare(contents)
+        if stream:
+            return self._stream_async(text, payload_bytes)
+        
+        start = time.perf_counter()
+        await asyncio.sleep(self._full_latency(text, payload_bytes))
+        elapsed = time.perf_counter() - start
+        self._record(payload_bytes, elapsed, elapsed)
+        return StubResponse(text)
+    
+    def _prepare(self, contents):
+        if isinstance(contents, str):
+            contents = [contents]
+        
+        payload = json.dumps({'contents': contents}, default=str).encode('utf-8')
+        last = contents[-1]
+        prompt = last['parts'][0] if isinstance(last, dict) else str(last)
+        return len(payload), self.reply_for(prompt)
+    
+    def _first_chunk_latency(self, payload_bytes):
+        return self.base_latency + payload_bytes / 1024 * self.seconds_per_kb
+    
+    def _full_latency(self, text, payload_bytes):
+        return self._first_chunk_latency(payload_bytes) + self.chunk_latency * (len(self._split(text)) - 1)
+    
+    def _split(self, text):
+        words = re.split(r'(?<=\s)', text)
+        return [''.join(words[i:i + self.words_per_chunk]) for i in range(0, len(words), self.words_per_chunk)]
+    
+    def _stream(self, text, payload_bytes):
+        start = time.perf_counter()
+        time.sleep(self._first_chunk_latency(payload_bytes))
+        first_chunk = time.perf_counter() - start
+        
+        for index, chunk in enumerate(self._split(text)):
+            if index:
+                time.sleep(self.chunk_latency)
+            yield StubResponse(chunk)
+        self._record(payload_bytes, time.perf_counter() - start, first_chunk)
+    
+    async def _stream_async(self, text, payload_bytes):
+        start = time.perf_counter()
+        await asyncio.sleep(self._first_chunk_latency(payload_bytes))
+        first_chunk = time.perf_counter() - start
+        
+        for index, chunk in enumerate(self._split(text)):
+            if index:
+                await asyncio.sleep(self.chunk_latency)
+            yield StubResponse(chunk)
+        self._record(payload_bytes, time.perf_counter() - start, first_chunk)
+    
+    def _record(self, payload_bytes, seconds, first_chunk):
+        with self.lock:
+            self.requests.append({'bytes': payload_bytes, 'seconds': seconds, 'first_chunk': first_chunk})
@@ -0,0 +1,57 @@
+from chat_session import ChatSessionManager
+from stub_model import StubModel
+
+
+def make_manager(**options):
+    return ChatSessionManager(StubModel(base_latency=0, seconds_per_kb=0, chunk_latency=0),
+                              'system prompt', **options)
+
+
+def test_evicted_sessions_drop_their_transcript(tmp_path):
+    manager = make_manager(store_dir=str(tmp_path), max_sessions=3)
+    for chat in range(20):
+        manager.send_message(f"chat-{chat}", 'hello')
+
+    assert len(manager.sessions) == 3
+    assert len(manager.transcripts) == 3
+    assert [turn['role'] for turn in manager.history('chat-0')] == ['user', 'model']
+
+
+def test_evicted_session_is_rebuilt_from_the_store(tmp_path):
+    manager = make_manager(store_dir=str(tmp_path), max_sessions=1)
+    manager.send_message('first', 'one')
+    manager.send_message('second', 'two')
+    manager.send_message('first', 'three')
+
+    assert manager.stats()['rebuilt'] == 1
+    assert [turn['parts'][0] for turn in manager.history('first')][::2] == ['one', 'three']
+
+
+def test_abandoned_stream_drops_the_session(tmp_path):
+    manager = make_manager(store_dir=str(tmp_path))
+    manager.send_message('chat', 'one')
+    stream = manager.stream_message('chat', 'two')
+    next(stream)
+    stream.close()
+
+    assert 'chat' not in manager.sessions
+    assert 'chat' not in manager.transcripts
+    assert len(manager.history('chat')) == 2
+
+
+def test_ids_that_sanitize_alike_keep_separate_transcripts(tmp_path):
+    manager = make_manager(store_dir=str(tmp_path), max_sessions=1)
+    manager.send_message('a/b', 'slash')
+    manager.send_message('a_b', 'underscore')
+
+    assert manager.history('a/b')[0]['parts'] == ['slash']
+    assert manager.history('a_b')[0]['parts'] == ['underscore']
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_stats_count_only_the_new_message():
+    manager = make_manager()
+    manager.send_message('chat', 'hello')
+    manager.send_message('chat', 'héllo')
+
+    assert manager.stats()['bytes_handed_over'] == 11
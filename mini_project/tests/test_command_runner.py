@@ -0,0 +1,52 @@
+import pytest
+
+from command_runner import clip_output, is_parallel_safe, plan_stages
+
+
+@pytest.mark.parametrize('command', [
+    'ls -la',
+    'df -h',
+    'ps aux | grep python | wc -l',
+    'uptime && whoami; date',
+    'grep foo < notes.txt',
+])
+def test_read_only_commands_are_parallel_safe(command):
+    assert is_parallel_safe(command)
+
+
+@pytest.mark.parametrize('command', [
+    'rm -rf build',
+    'ls > listing.txt',
+    'echo hi >> notes.txt',
+    'cat `which python`',
+    'echo $(rm file)',
+    'cat <(rm file)',
+    'cat x & rm -rf y',
+    'ls &',
+    'ls | xargs rm',
+    'ls ||',
+    '',
+])
+def test_writes_subshells_and_unknown_programs_are_not(command):
+    assert not is_parallel_safe(command)
+
+
+def test_plan_stages_groups_neighbouring_read_only_commands():
+    commands = ['ls', 'df -h', 'mkdir out', 'uptime', 'whoami', 'cat <(ls)', 'pwd']
+    assert plan_stages(commands) == [[0, 1], [2], [3, 4], [5], [6]]
+
+
+def test_plan_stages_does_not_run_background_jobs_alongside_readers():
+    assert plan_stages(['ls', 'cat x & rm -rf y', 'ls ~/y']) == [[0], [1], [2]]
+
+
+def test_plan_stages_keeps_writes_in_their_own_stage():
+    assert plan_stages(['touch a', 'touch b']) == [[0], [1]]
+    assert plan_stages([]) == []
+
+
+def test_clip_output_stops_at_the_limit():
+    text, emitted = clip_output('abcdef', 0, 4)
+    assert (text, emitted) == ('abcd\n… output truncated', 4)
+    assert clip_output('more', emitted, 4) == ('', 4)
+    assert clip_output('ab', 0, 4) == ('ab', 2)